@@ -0,0 +1,7 @@
+"""Small compatibility shims for older Python versions."""
+
+import sys
+
+# Keyword arguments for @dataclass that add __slots__ where supported (3.10+).
+# On older interpreters the classes simply keep a per-instance __dict__.
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
@@ -1,7 +1,25 @@
+import codecs
 import csv
+import io
+import re
 import chardet
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
+
+# Large read buffer for the main parse: fewer read syscalls on big exports
+_READ_BUFFER_SIZE = 1 << 20
+
+# A header line with at least this many of one delimiter (and more of it than
+# of any other candidate) is trusted without running csv.Sniffer
+_CONFIDENT_DELIMITER_COUNT = 3
+
+# Bytes sampled (once) for encoding and delimiter detection
+_ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# Same chunk size TextIOWrapper decodes in
+_DECODE_CHUNK_SIZE = 8192
+
+_LINE_BREAK_RE = re.compile(r'[\r\n]')
 
 
 class CsvAdapter:
@@ -17,64 +35,134 @@ class CsvAdapter:
         """Check if this adapter can handle the given file."""
         return Path(file_path).suffix.lower() in [".csv", ".tsv"]
     
-    def _detect_encoding(self, file_path: str) -> str:
-        """Detect file encoding using chardet with fallback."""
+    def _detect_sample_encoding(self, raw_data: bytes) -> str:
+        """Detect the encoding of a raw byte sample from the start of a file."""
         try:
-            with open(file_path, 'rb') as f:
-                raw_data = f.read(10000)  # Read first 10KB for detection
-                
-                # Check for BOM first
-                if raw_data.startswith(b'\xef\xbb\xbf'):
-                    return 'utf-8-sig'
-                
-                # Use chardet for detection
-                result = chardet.detect(raw_data)
-                encoding = result.get('encoding', 'utf-8')
-                
-                # Handle common encoding issues
-                if encoding is None:
-                    encoding = 'utf-8'
-                
-                # Normalize common encodings
-                encoding_lower = encoding.lower()
-                if 'utf-8' in encoding_lower or 'utf8' in encoding_lower:
+            # Check for BOM first
+            if raw_data.startswith(b'\xef\xbb\xbf'):
+                return 'utf-8-sig'
+            
+            # ASCII or valid UTF-8 samples are the common case and need no
+            # statistical guess. A sample cut mid-character at the size
+            # limit is still UTF-8, hence the incremental decoder. NUL
+            # bytes point to BOM-less UTF-16/32, which is left to chardet.
+            if b'\x00' not in raw_data:
+                if raw_data.isascii():
                     return 'utf-8'
-                
-                return encoding
+                try:
+                    codecs.getincrementaldecoder('utf-8')().decode(
+                        raw_data, final=len(raw_data) < _ENCODING_SAMPLE_SIZE
+                    )
+                    return 'utf-8'
+                except UnicodeDecodeError:
+                    pass
+            
+            # Use chardet for detection
+            result = chardet.detect(raw_data)
+            encoding = result.get('encoding', 'utf-8')
+            
+            # Handle common encoding issues
+            if encoding is None:
+                encoding = 'utf-8'
+            
+            # Normalize common encodings
+            encoding_lower = encoding.lower()
+            if 'utf-8' in encoding_lower or 'utf8' in encoding_lower:
+                return 'utf-8'
+            
+            return encoding
         except Exception:
             # Fallback to UTF-8 if detection fails
             return 'utf-8'
     
-    def _detect_delimiter(self, file_path: str, encoding: str) -> str:
-        """Detect CSV delimiter by analyzing the first line."""
+    def _detect_delimiter_with_confidence(
+        self,
+        file_path: str,
+        encoding: str,
+        sample: bytes,
+    ) -> Tuple[str, bool]:
+        """Detect the delimiter and whether the first line makes it unambiguous.
+        
+        The first line comes from the raw sample at the start of the file
+        (decoding only as much of it as needed). The detection is confident
+        when the winning delimiter occurs at least _CONFIDENT_DELIMITER_COUNT
+        times and strictly more often than the other candidates; callers can
+        then skip the slower csv.Sniffer pass.
+        
+        Returns:
+            Tuple of (delimiter, confident)
+        """
         path = Path(file_path)
         suffix = path.suffix.lower()
         
-        # TSV files use tab delimiter
-        if suffix == '.tsv':
-            return '\t'
-        
         # For CSV, try to detect delimiter
         try:
-            with open(file_path, 'r', encoding=encoding, newline='') as f:
-                # Read first line
-                first_line = f.readline()
-                
-                # Count occurrences of common delimiters
-                comma_count = first_line.count(',')
-                semicolon_count = first_line.count(';')
-                tab_count = first_line.count('\t')
-                
-                # Return delimiter with highest count
-                if tab_count > comma_count and tab_count > semicolon_count:
-                    return '\t'
-                elif semicolon_count > comma_count:
-                    return ';'
-                else:
-                    return ','
+            first_line = self._first_line_from_sample(sample, encoding)
+            
+            # Count occurrences of common delimiters
+            comma_count = first_line.count(',')
+            semicolon_count = first_line.count(';')
+            tab_count = first_line.count('\t')
+            
+            # TSV files use tab delimiter
+            if suffix == '.tsv':
+                delimiter = '\t'
+            # Return delimiter with highest count
+            elif tab_count > comma_count and tab_count > semicolon_count:
+                delimiter = '\t'
+            elif semicolon_count > comma_count:
+                delimiter = ';'
+            else:
+                delimiter = ','
+            
+            counts = {',': comma_count, ';': semicolon_count, '\t': tab_count}
+            best = counts.pop(delimiter)
+            confident = best >= _CONFIDENT_DELIMITER_COUNT and best > max(counts.values())
+            return delimiter, confident
         except Exception:
-            # Default to comma if detection fails
-            return ','
+            # Default to comma (tab for .tsv) if detection fails
+            return ('\t' if suffix == '.tsv' else ','), False
+    
+    def _first_line_from_sample(self, sample: bytes, encoding: str) -> str:
+        """Decode the first line of a raw sample, a text-layer chunk at a time.
+        
+        Decoding stops at the first line break, so (as with readline on a text
+        handle) undecodable bytes further into the file do not matter here.
+        """
+        decoder = codecs.getincrementaldecoder(encoding)()
+        text = ''
+        for start in range(0, len(sample), _DECODE_CHUNK_SIZE):
+            text += decoder.decode(sample[start:start + _DECODE_CHUNK_SIZE])
+            match = _LINE_BREAK_RE.search(text)
+            if match:
+                return text[:match.start()]
+        return text
+    
+    def _iter_row_dicts(self, reader: Iterator[List[str]]) -> Iterator[Dict[str, str]]:
+        """Build row dictionaries from a csv.reader.
+        
+        Produces the rows csv.DictReader plus a str()-cleaning pass used to,
+        without the per-row overhead of either: the first row supplies the
+        headers, blank lines are skipped, missing trailing fields become '' and
+        surplus fields are kept under the None key as the string form of their
+        list. Shared by the primary and fallback-encoding read paths.
+        """
+        headers = next(reader, None)
+        if headers is None:
+            return
+        width = len(headers)
+        
+        for row in reader:
+            if not row:
+                continue
+            row_dict = dict(zip(headers, row))
+            length = len(row)
+            if length < width:
+                for key in headers[length:]:
+                    row_dict[key] = ''
+            elif length > width:
+                row_dict[None] = str(row[width:])
+            yield row_dict
     
     def read(self, file_path: str) -> List[Dict[str, Any]]:
         """Read CSV file and return raw rows as list of dictionaries.
@@ -90,6 +178,28 @@ class CsvAdapter:
             FileNotFoundError: If file doesn't exist
             ValueError: If file is empty or cannot be parsed
         """
+        return list(self.iread(file_path))
+    
+    def iread(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Stream CSV rows one dictionary at a time.
+        
+        The file is checked up front; parsing happens lazily as rows are
+        consumed, so memory stays flat regardless of file size. If a decode
+        error only shows up after some rows were yielded, the remaining rows
+        are taken from the fallback encoding (rows already yielded are not
+        repeated).
+        
+        Args:
+            file_path: Path to the CSV/TSV file
+            
+        Returns:
+            Iterator of dictionaries, one per row, keyed by column name
+            
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            ValueError: If the file cannot be decoded or parsed (raised while
+                iterating)
+        """
         path = Path(file_path)
         
         # Check if file exists
@@ -98,39 +208,51 @@ class CsvAdapter:
         
         # Check if file is empty
         if path.stat().st_size == 0:
-            return []
-        
-        # Detect encoding
-        encoding = self._detect_encoding(file_path)
-        
-        # Detect delimiter
-        delimiter = self._detect_delimiter(file_path, encoding)
+            return iter(())
         
+        return self._iread(file_path)
+    
+    def _iread(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Generator behind iread(); see there for behaviour."""
         # Read CSV file
-        rows = []
+        delimiter = ','
+        yielded = 0
         try:
-            with open(file_path, 'r', encoding=encoding, newline='') as f:
+            with open(file_path, 'rb', buffering=_READ_BUFFER_SIZE) as raw:
+                # One raw sample feeds both encoding and delimiter detection
+                raw_sample = raw.read(_ENCODING_SAMPLE_SIZE)
+                raw.seek(0)
+                
+                # Detect encoding
+                encoding = self._detect_sample_encoding(raw_sample)
+                
+                # Detect delimiter from the first line of the sample
+                delimiter, confident = self._detect_delimiter_with_confidence(
+                    file_path, encoding, sample=raw_sample
+                )
+                
+                f = io.TextIOWrapper(raw, encoding=encoding, newline='')
+                
                 # Use Sniffer for more robust delimiter detection if needed
-                try:
-                    sample = f.read(1024)
+                if not confident:
+                    try:
+                        sample = f.read(1024)
+                        sniffer = csv.Sniffer()
+                        dialect = sniffer.sniff(sample, delimiters=',;\t')
+                        delimiter = dialect.delimiter
+                    except (csv.Error, Exception):
+                        # Fall back to detected delimiter
+                        pass
+                    # Always rewind so a decode error in the sample resurfaces below
+                    # and triggers the encoding fallback instead of silently
+                    # resuming mid-file
                     f.seek(0)
-                    sniffer = csv.Sniffer()
-                    dialect = sniffer.sniff(sample, delimiters=',;\t')
-                    delimiter = dialect.delimiter
-                except (csv.Error, Exception):
-                    # Fall back to detected delimiter
-                    pass
                 
-                reader = csv.DictReader(f, delimiter=delimiter)
+                reader = csv.reader(f, delimiter=delimiter)
                 
-                # Read all rows
-                for row in reader:
-                    # Convert all values to strings, handling None
-                    cleaned_row = {
-                        key: str(value) if value is not None else ''
-                        for key, value in row.items()
-                    }
-                    rows.append(cleaned_row)
+                for row in self._iter_row_dicts(reader):
+                    yield row
+                    yielded += 1
         
         except UnicodeDecodeError as e:
             # Try with different encoding as fallback
@@ -138,21 +260,15 @@ class CsvAdapter:
             for fallback_encoding in fallback_encodings:
                 try:
                     with open(file_path, 'r', encoding=fallback_encoding, newline='') as f:
-                        reader = csv.DictReader(f, delimiter=delimiter)
-                        rows = [
-                            {
-                                key: str(value) if value is not None else ''
-                                for key, value in row.items()
-                            }
-                            for row in reader
-                        ]
+                        reader = csv.reader(f, delimiter=delimiter)
+                        rows = list(self._iter_row_dicts(reader))
                         break
                 except (UnicodeDecodeError, Exception):
                     continue
             else:
                 raise ValueError(f"Could not decode file {file_path}: {e}")
+            
+            yield from rows[yielded:]
         
         except csv.Error as e:
             raise ValueError(f"Error parsing CSV file {file_path}: {e}")
-        
-        return rows
\ No newline at end of file
@@ -1,19 +1,125 @@
+import datetime
+import sys
+import zipfile
+from collections import namedtuple
+from xml.etree import ElementTree
 import openpyxl
 from pathlib import Path
 
+try:
+    # Optional Rust-backed reader; several times faster than openpyxl on large sheets
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+_SPREADSHEETML_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
 class ExcelAdapter:
     def can_handle(self, file_path):
         return Path(file_path).suffix.lower() in [".xlsx", ".xls"]
 
+    def iread(self, file_path):
+        rows = self._iter_rows(file_path)
+
+        headers = next(rows, None)
+        if headers is None:
+            return
+
+        for row in rows:
+            yield dict(zip(headers, row))
+
     def read(self, file_path):
-        wb = openpyxl.load_workbook(file_path, data_only=True)
-        ws = wb.active
+        return list(self.iread(file_path))
+
+    def read_records(self, file_path):
+        # Lighter than dicts: one namedtuple class per sheet, fields in header order.
+        # Headers that are not valid identifiers (or repeat) become _0, _1, ...
+        rows = self._iter_rows(file_path)
+
+        headers = next(rows, None)
+        if headers is None:
+            return []
+
+        Row = namedtuple("Row", [str(h) for h in headers], rename=True)
+        width = len(headers)
+        padding = (None,) * width
+
+        records = []
+        for row in rows:
+            if len(row) != width:
+                row = (tuple(row) + padding)[:width]
+            records.append(Row._make(row))
+        return records
+
+    def _iter_rows(self, file_path):
+        # Yields the header row (with string headers interned, since every row
+        # dict shares them as keys) followed by the raw data rows
+        if CalamineWorkbook is not None:
+            rows = self._iter_rows_calamine(file_path)
+        else:
+            rows = self._iter_rows_openpyxl(file_path)
+
+        headers = next(rows, None)
+        if headers is None:
+            return
+        yield [sys.intern(h) if type(h) is str else h for h in headers]
+        yield from rows
+
+    def _iter_rows_openpyxl(self, file_path):
+        # read_only streams the sheet XML instead of building every Cell up front
+        wb = openpyxl.load_workbook(file_path, data_only=True, read_only=True)
+        try:
+            yield from wb.active.iter_rows(values_only=True)
+        finally:
+            wb.close()
+
+    def _iter_rows_calamine(self, file_path):
+        # calamine has no notion of the active sheet, so it is looked up in the
+        # workbook XML to read the same sheet as openpyxl (the first sheet for
+        # files that are not .xlsx)
+        sheet_name = _active_sheet_name(file_path)
+        wb = CalamineWorkbook.from_path(str(file_path))
+        try:
+            if sheet_name is not None:
+                sheet = wb.get_sheet_by_name(sheet_name)
+            else:
+                sheet = wb.get_sheet_by_index(0)
+            # Keep leading empty rows/columns so the grid lines up with openpyxl
+            for row in sheet.to_python(skip_empty_area=False):
+                yield [_from_calamine(value) for value in row]
+        finally:
+            wb.close()
+
+
+def _active_sheet_name(file_path):
+    # Name of the sheet openpyxl's wb.active returns: the activeTab of the
+    # first workbookView (default 0), counted in <sheets> order. None when the
+    # file is not an .xlsx package or the tab cannot be resolved
+    try:
+        with zipfile.ZipFile(file_path) as package:
+            root = ElementTree.fromstring(package.read("xl/workbook.xml"))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+        return None
+
+    view = root.find(f"{_SPREADSHEETML_NS}bookViews/{_SPREADSHEETML_NS}workbookView")
+    try:
+        active = int(view.get("activeTab", 0)) if view is not None else 0
+    except ValueError:
+        active = 0
 
-        rows = []
-        headers = [cell.value for cell in ws[1]]
+    sheets = root.findall(f"{_SPREADSHEETML_NS}sheets/{_SPREADSHEETML_NS}sheet")
+    if not 0 <= active < len(sheets):
+        return None
+    return sheets[active].get("name")
 
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            row_dict = dict(zip(headers, row))
-            rows.append(row_dict)
 
-        return rows
\ No newline at end of file
+def _from_calamine(value):
+    # Match the values openpyxl returns: empty cells are None, whole numbers are
+    # int (calamine reports every number as float) and dates are datetimes
+    if value == "":
+        return None
+    if type(value) is float and value.is_integer():
+        return int(value)
+    if type(value) is datetime.date:
+        return datetime.datetime.combine(value, datetime.time())
+    return value
@@ -4,10 +4,68 @@ This module computes statistical profiles from sample column values to help
 disambiguate ambiguous column names by analyzing the actual data content.
 """
 
+import random
 import re
-import statistics
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, List, Any, Optional, Sequence, Tuple
 from collections import Counter
+from functools import lru_cache
+
+# Exactly the strings float() accepts once surrounding whitespace is stripped:
+# optional sign, digit groups with single underscores between digits (\d
+# covers the same Unicode decimal digits float() does), optional fraction and
+# exponent, or inf/infinity/nan in any case. Spelled out instead of using
+# re.IGNORECASE, which would also let through look-alikes such as dotless i.
+_DIGIT_PART = r'\d(?:_?\d)*'
+_NUMERIC_RE = re.compile(
+    r'[+-]?(?:(?:' + _DIGIT_PART + r'(?:\.(?:' + _DIGIT_PART + r')?)?|\.' + _DIGIT_PART + r')'
+    r'(?:[eE][+-]?' + _DIGIT_PART + r')?'
+    r'|[iI][nN][fF](?:[iI][nN][iI][tT][yY])?|[nN][aA][nN])'
+)
+
+_PUNCTUATION = '.,;:!?-\'"/()[]{}_'
+
+# 256-entry byte classification table for ASCII text: every byte maps to its
+# class marker (same precedence as the fallback loop: digit, letter,
+# whitespace, punctuation), anything else to 0. One bytes.translate plus a
+# count per class replaces per-character predicate calls.
+_CLASS_DIGIT, _CLASS_LETTER, _CLASS_WHITESPACE, _CLASS_PUNCTUATION = 1, 2, 3, 4
+
+
+def _ascii_char_class(code: int) -> int:
+    """Return the class marker for an ASCII code point."""
+    char = chr(code)
+    if char.isdigit():
+        return _CLASS_DIGIT
+    if char.isalpha():
+        return _CLASS_LETTER
+    if char.isspace():
+        return _CLASS_WHITESPACE
+    if char in _PUNCTUATION:
+        return _CLASS_PUNCTUATION
+    return 0
+
+
+_CHAR_CLASS_TABLE = bytes(_ascii_char_class(code) if code < 128 else 0 for code in range(256))
+
+
+def _histogram_median(histogram: List[Tuple[int, int]], total: int) -> float:
+    """Median of integer data given as sorted (value, count) pairs.
+    
+    Same result as statistics.median: the middle value for an odd total, the
+    mean of the two middle values otherwise.
+    """
+    upper_rank = total // 2
+    lower_rank = upper_rank if total % 2 else upper_rank - 1
+    
+    lower = None
+    seen = 0
+    for value, count in histogram:
+        seen += count
+        if lower is None and seen > lower_rank:
+            lower = value
+        if seen > upper_rank:
+            return lower if lower_rank == upper_rank else (lower + value) / 2
+    raise ValueError("empty histogram")
 
 
 class ColumnProfiler:
@@ -69,32 +127,54 @@ class ColumnProfiler:
         (r'[Kk][Ww]', 'kW'),
     ]
     
-    def __init__(self, sample_size: int = 200):
+    # All of the above folded into one compiled scanner so each value is matched
+    # once. The optional lookaheads record whether any MPN / reference
+    # designator pattern matches the whole value; the unit alternation then
+    # tries the unit patterns in list order, so the first one found anywhere in
+    # the value wins, exactly as with sequential re.search calls.
+    _PATTERN_SCAN_RE = re.compile(
+        '(?:(?=(?P<mpn>' + '|'.join(f'(?:{p})' for p in MPN_PATTERNS) + ')))?'
+        '(?:(?=(?P<ref_des>' + '|'.join(f'(?:{p})' for p in REF_DES_PATTERNS) + ')))?'
+        '(?:' + '|'.join(f'(?=.*?(?P<unit_{i}>{p}))' for i, (p, _) in enumerate(UNIT_PATTERNS)) + ')?',
+        re.DOTALL,
+    )
+    # Capture group number -> unit name, so a hit is resolved from
+    # match.lastindex with one dict lookup (the unit groups are the last
+    # len(UNIT_PATTERNS) groups of the scanner, in list order)
+    _UNIT_BY_GROUP = dict(zip(
+        range(_PATTERN_SCAN_RE.groups - len(UNIT_PATTERNS) + 1, _PATTERN_SCAN_RE.groups + 1),
+        [name for _, name in UNIT_PATTERNS],
+    ))
+    
+    def __init__(self, sample_size: int = 200, seed: int = 0):
         """Initialize the column profiler.
         
         Args:
             sample_size: Maximum number of non-null values to sample (default: 200)
+            seed: Seed for reservoir sampling of columns longer than sample_size,
+                so repeated profiles of the same data agree (default: 0)
         """
         self.sample_size = sample_size
+        self.seed = seed
     
-    def profile_column(self, column_name: str, values: List[Any]) -> Dict[str, Any]:
+    def profile_column(self, column_name: str, values: Iterable[Any]) -> Dict[str, Any]:
         """Compute a statistical profile for a column.
         
         Args:
             column_name: Name of the column being profiled
-            values: List of all values in the column
+            values: All values in the column; any iterable, consumed once
             
         Returns:
             Dictionary containing the column profile with statistics
         """
-        # Get sample of non-null values
-        sample = self._get_sample(values)
+        # Sample non-null values and count nulls in the same pass
+        sample, null_count = self._sample_and_count_nulls(values)
         
         if not sample:
             return {
                 'column_name': column_name,
                 'sample_size': 0,
-                'null_count': len([v for v in values if v is None or v == '']),
+                'null_count': null_count,
                 'error': 'No non-null values found'
             }
         
@@ -105,233 +185,192 @@ class ColumnProfiler:
             return {
                 'column_name': column_name,
                 'sample_size': 0,
-                'null_count': len([v for v in values if v is None or v == '']),
+                'null_count': null_count,
                 'error': 'No valid string values found'
             }
         
         profile = {
             'column_name': column_name,
             'sample_size': len(sample_str),
-            'null_count': len([v for v in values if v is None or v == '']),
-            'type_distribution': self._infer_type_distribution(sample_str),
-            'regex_hits': self._check_regex_patterns(sample_str),
-            'unit_presence': self._detect_units(sample_str),
-            'cardinality': self._compute_cardinality(sample_str),
-            'length_stats': self._compute_length_stats(sample_str),
-            'character_class_stats': self._compute_character_class_stats(sample_str),
+            'null_count': null_count,
         }
+        # Identical samples (e.g. the same column across two snapshots) are
+        # served from the cache; each caller gets its own copy of the stats
+        cached = _profile_sample(type(self), tuple(sample_str))
+        profile.update({key: dict(stats) for key, stats in cached.items()})
         
         return profile
     
-    def _get_sample(self, values: List[Any]) -> List[Any]:
+    def _get_sample(self, values: Iterable[Any]) -> List[Any]:
         """Get a sample of non-null values from the column.
         
         Args:
-            values: List of all values
+            values: All values in the column
             
         Returns:
             List of up to sample_size non-null values
         """
-        non_null = [v for v in values if v is not None and v != '']
-        return non_null[:self.sample_size]
+        return self._sample_and_count_nulls(values)[0]
     
-    def _infer_type_distribution(self, values: List[str]) -> Dict[str, float]:
-        """Infer type distribution: numeric vs text vs mixed.
+    def _sample_and_count_nulls(self, values: Iterable[Any]) -> Tuple[List[Any], int]:
+        """Reservoir-sample non-null values and count nulls in one streaming pass.
+        
+        Columns with at most sample_size non-null values are returned whole, in
+        order. Longer columns are sampled uniformly (Algorithm R) instead of
+        taking the first sample_size values, which over-represents the top of
+        the file.
         
         Args:
-            values: List of string values
+            values: All values in the column; any iterable, consumed once
             
         Returns:
-            Dictionary with 'numeric', 'text', and 'mixed' ratios
+            Tuple of (sampled non-null values, number of None/empty values)
         """
-        numeric_count = 0
-        text_count = 0
+        k = self.sample_size
+        sample = []
+        seen = 0
+        null_count = 0
+        randrange = None
         
         for value in values:
-            # Try to parse as number (int or float)
-            try:
-                float(value)
-                numeric_count += 1
-            except (ValueError, TypeError):
-                text_count += 1
-        
-        total = len(values)
-        if total == 0:
-            return {'numeric': 0.0, 'text': 0.0, 'mixed': 0.0}
-        
-        numeric_ratio = numeric_count / total
-        text_ratio = text_count / total
-        
-        # Determine if mixed (both types present)
-        mixed_ratio = 1.0 if (numeric_count > 0 and text_count > 0) else 0.0
-        
-        return {
-            'numeric': numeric_ratio,
-            'text': text_ratio,
-            'mixed': mixed_ratio
-        }
+            if value is None or value == '':
+                null_count += 1
+                continue
+            
+            if seen < k:
+                sample.append(value)
+            else:
+                if randrange is None:
+                    randrange = random.Random(self.seed).randrange
+                j = randrange(seen + 1)
+                if j < k:
+                    sample[j] = value
+            seen += 1
+        
+        return sample, null_count
     
-    def _check_regex_patterns(self, values: List[str]) -> Dict[str, float]:
-        """Check for regex pattern matches (MPN, reference designators).
+    @classmethod
+    def _profile_values(cls, values: Sequence[str]) -> Dict[str, Dict[str, float]]:
+        """Compute all per-value statistics in a single pass over the sample.
+        
+        Type inference, regex/unit matching, cardinality, length and character
+        class counters are accumulated together so each value is visited once.
         
         Args:
-            values: List of string values
+            values: Non-empty sequence of stripped string values
             
         Returns:
-            Dictionary with match ratios for each pattern type
+            Dictionary with type_distribution, regex_hits, unit_presence,
+            cardinality, length_stats and character_class_stats
         """
+        is_numeric = _NUMERIC_RE.fullmatch
+        scan = cls._PATTERN_SCAN_RE.match
+        unit_by_group = cls._UNIT_BY_GROUP
+        
+        numeric_count = 0
         mpn_matches = 0
         ref_des_matches = 0
+        unit_counts = Counter()
+        value_counts = Counter()
+        lengths = []
+        ascii_values = []
+        digit_count = 0
+        punct_count = 0
+        letter_count = 0
+        whitespace_count = 0
         
         for value in values:
-            # Check MPN patterns
-            for pattern in self.MPN_PATTERNS:
-                if re.match(pattern, value):
-                    mpn_matches += 1
-                    break
+            # Numeric if float() would parse it; matched without raising on text
+            if is_numeric(value):
+                numeric_count += 1
             
-            # Check reference designator patterns
-            for pattern in self.REF_DES_PATTERNS:
-                if re.match(pattern, value):
-                    ref_des_matches += 1
-                    break
-        
-        total = len(values)
-        if total == 0:
-            return {'mpn_like': 0.0, 'ref_des_like': 0.0}
-        
-        return {
-            'mpn_like': mpn_matches / total,
-            'ref_des_like': ref_des_matches / total
-        }
-    
-    def _detect_units(self, values: List[str]) -> Dict[str, float]:
-        """Detect presence of units in values.
-        
-        Args:
-            values: List of string values
+            match = scan(value)
+            if match.group('mpn') is not None:
+                mpn_matches += 1
+            if match.group('ref_des') is not None:
+                ref_des_matches += 1
+            # Unit groups close last, so lastindex is the unit's group when one hit
+            unit_name = unit_by_group.get(match.lastindex)
+            if unit_name is not None:
+                unit_counts[unit_name] += 1  # Count each value only once
             
-        Returns:
-            Dictionary with unit detection ratios for common units
-        """
-        unit_counts = Counter()
-        
-        for value in values:
-            # Check each unit pattern
-            for pattern, unit_name in self.UNIT_PATTERNS:
-                if re.search(pattern, value):
-                    unit_counts[unit_name] += 1
-                    break  # Count each value only once
-        
-        total = len(values)
-        if total == 0:
-            return {}
-        
-        # Return ratios for each detected unit
-        unit_presence = {}
-        for unit_name in unit_counts:
-            unit_presence[unit_name] = unit_counts[unit_name] / total
-        
-        return unit_presence
-    
-    def _compute_cardinality(self, values: List[str]) -> Dict[str, float]:
-        """Compute cardinality statistics: unique ratio, repeated ratio.
-        
-        Args:
-            values: List of string values
+            value_counts[value] += 1
+            lengths.append(len(value))
             
-        Returns:
-            Dictionary with unique_ratio and repeated_ratio
-        """
-        if not values:
-            return {'unique_ratio': 0.0, 'repeated_ratio': 0.0}
+            if value.isascii():
+                ascii_values.append(value)
+            else:
+                # Unicode digits/letters/spaces need the full str predicates
+                for char in value:
+                    if char.isdigit():
+                        digit_count += 1
+                    elif char.isalpha():
+                        letter_count += 1
+                    elif char.isspace():
+                        whitespace_count += 1
+                    elif char in _PUNCTUATION:
+                        punct_count += 1
+        
+        # Classify all ASCII values as one contiguous buffer: a single
+        # table-driven translate per column, then one count per class
+        classes = ''.join(ascii_values).encode('ascii').translate(_CHAR_CLASS_TABLE)
+        digit_count += classes.count(_CLASS_DIGIT)
+        letter_count += classes.count(_CLASS_LETTER)
+        whitespace_count += classes.count(_CLASS_WHITESPACE)
+        punct_count += classes.count(_CLASS_PUNCTUATION)
         
-        value_counts = Counter(values)
         total = len(values)
+        text_count = total - numeric_count
         unique_count = len(value_counts)
-        
-        unique_ratio = unique_count / total
-        
         # Count values that appear more than once
         repeated_count = sum(1 for count in value_counts.values() if count > 1)
-        repeated_ratio = repeated_count / unique_count if unique_count > 0 else 0.0
-        
-        return {
-            'unique_ratio': unique_ratio,
-            'repeated_ratio': repeated_ratio,
-            'unique_count': unique_count,
-            'total_count': total
-        }
-    
-    def _compute_length_stats(self, values: List[str]) -> Dict[str, float]:
-        """Compute length statistics: mean, median, min, max.
-        
-        Args:
-            values: List of string values
-            
-        Returns:
-            Dictionary with length statistics
-        """
-        if not values:
-            return {'mean': 0.0, 'median': 0.0, 'min': 0.0, 'max': 0.0}
-        
-        lengths = [len(v) for v in values]
-        
-        return {
-            'mean': statistics.mean(lengths),
-            'median': statistics.median(lengths),
-            'min': min(lengths),
-            'max': max(lengths)
-        }
-    
-    def _compute_character_class_stats(self, values: List[str]) -> Dict[str, float]:
-        """Compute character class statistics: percent digits, punctuation, letters.
-        
-        Args:
-            values: List of string values
-            
-        Returns:
-            Dictionary with character class percentages
-        """
-        if not values:
-            return {
-                'percent_digits': 0.0,
-                'percent_punctuation': 0.0,
-                'percent_letters': 0.0,
-                'percent_whitespace': 0.0
-            }
+        total_chars = sum(lengths)
         
-        total_chars = 0
-        digit_count = 0
-        punct_count = 0
-        letter_count = 0
-        whitespace_count = 0
-        
-        for value in values:
-            for char in value:
-                total_chars += 1
-                if char.isdigit():
-                    digit_count += 1
-                elif char.isalpha():
-                    letter_count += 1
-                elif char.isspace():
-                    whitespace_count += 1
-                elif char in '.,;:!?-\'"/()[]{}_':
-                    punct_count += 1
+        # Lengths are small integers with few distinct values: a histogram
+        # gives min, max and median without statistics' pure-Python paths
+        length_histogram = sorted(Counter(lengths).items())
         
         if total_chars == 0:
-            return {
+            character_class_stats = {
                 'percent_digits': 0.0,
                 'percent_punctuation': 0.0,
                 'percent_letters': 0.0,
                 'percent_whitespace': 0.0
             }
+        else:
+            character_class_stats = {
+                'percent_digits': (digit_count / total_chars) * 100,
+                'percent_punctuation': (punct_count / total_chars) * 100,
+                'percent_letters': (letter_count / total_chars) * 100,
+                'percent_whitespace': (whitespace_count / total_chars) * 100
+            }
         
         return {
-            'percent_digits': (digit_count / total_chars) * 100,
-            'percent_punctuation': (punct_count / total_chars) * 100,
-            'percent_letters': (letter_count / total_chars) * 100,
-            'percent_whitespace': (whitespace_count / total_chars) * 100
+            'type_distribution': {
+                'numeric': numeric_count / total,
+                'text': text_count / total,
+                # Mixed when both types are present
+                'mixed': 1.0 if (numeric_count > 0 and text_count > 0) else 0.0
+            },
+            'regex_hits': {
+                'mpn_like': mpn_matches / total,
+                'ref_des_like': ref_des_matches / total
+            },
+            # Ratios for each detected unit
+            'unit_presence': {unit_name: count / total for unit_name, count in unit_counts.items()},
+            'cardinality': {
+                'unique_ratio': unique_count / total,
+                'repeated_ratio': repeated_count / unique_count,
+                'unique_count': unique_count,
+                'total_count': total
+            },
+            'length_stats': {
+                'mean': total_chars / total,
+                'median': _histogram_median(length_histogram, total),
+                'min': length_histogram[0][0],
+                'max': length_histogram[-1][0]
+            },
+            'character_class_stats': character_class_stats,
         }
     
     def profile_dataframe(self, data: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
@@ -346,15 +385,24 @@ class ColumnProfiler:
         if not data:
             return {}
         
-        # Collect all column names
-        all_columns = set()
-        for row in data:
-            all_columns.update(row.keys())
-        
-        # Extract values for each column
+        # Transpose rows into per-column value lists in a single pass over the
+        # data. Rows lacking a column get None (back-filled when the column
+        # next appears, padded at the end otherwise), so every list lines up
+        # with the rows just as row.get(column) would.
         column_values = {}
-        for column in all_columns:
-            column_values[column] = [row.get(column) for row in data]
+        for index, row in enumerate(data):
+            for column, value in row.items():
+                values = column_values.get(column)
+                if values is None:
+                    values = column_values[column] = [None] * index
+                elif len(values) < index:
+                    values.extend([None] * (index - len(values)))
+                values.append(value)
+        
+        row_count = len(data)
+        for values in column_values.values():
+            if len(values) < row_count:
+                values.extend([None] * (row_count - len(values)))
         
         # Profile each column
         profiles = {}
@@ -464,5 +512,11 @@ class ColumnProfiler:
         return sum(similarities) / len(similarities) if similarities else 0.0
 
 
-
-
+@lru_cache(maxsize=1024)
+def _profile_sample(profiler_cls: type, sample: Tuple[str, ...]) -> Dict[str, Dict[str, float]]:
+    """Memoized ColumnProfiler._profile_values, keyed by profiler class and sample.
+    
+    The result is shared between cache hits and must not be mutated; callers
+    copy the nested dictionaries before handing them out.
+    """
+    return profiler_cls._profile_values(sample)
@@ -2,6 +2,7 @@
 
 from .snapshot_diff import (
     diff_snapshots,
+    clear_diff_cache,
     DiffResult,
     SnapshotItemState,
     ModifiedItem,
@@ -29,6 +30,7 @@ from .change_events import (
 __all__ = [
     # Layer 1: Semantic Diff
     "diff_snapshots",
+    "clear_diff_cache",
     "DiffResult",
     "SnapshotItemState",
     "ModifiedItem",
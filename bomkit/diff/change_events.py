@@ -24,11 +24,22 @@ This layer is intentionally NOT:
 It behaves more like a compiler than an AI.
 """
 
+import json
+import re
+import sys
+from collections import Counter, defaultdict
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Dict, List, Optional, Set, Any, Tuple
+from typing import AbstractSet, Callable, Dict, List, Optional, Sequence, Any, Tuple
 from uuid import UUID
 
+try:
+    # Optional fast JSON encoder; to_json_bytes falls back to the stdlib json
+    import orjson
+except ImportError:
+    orjson = None
+
+from .._compat import DATACLASS_SLOTS
 from .snapshot_diff import DiffResult, ModifiedItem, FieldChange
 
 
@@ -98,13 +109,55 @@ class Domain(Enum):
     QUALITY = auto()        # Compliance, testing, reliability
 
 
+# Member names, looked up once instead of through the Enum.name descriptor
+_EVENT_TYPE_NAMES: Dict[ChangeEventType, str] = {t: t.name for t in ChangeEventType}
+_SEVERITY_NAMES: Dict[Severity, str] = {s: s.name for s in Severity}
+_DOMAIN_NAMES: Dict[Domain, str] = {d: d.name for d in Domain}
+
+
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    """Encode a to_dict() payload as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        payload, default=str, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
 # =============================================================================
 # ITEM DELTA (Canonical Abstraction)
 # =============================================================================
 # Reduces raw field-level diffs into a stable semantic surface.
 # This is the intermediate representation between Layer 1 and classification.
 
-@dataclass
+# Shared empty defaults. Deltas and events that carry no attributes or
+# evidence reference these instead of allocating empty containers.
+_NO_ATTRIBUTES: AbstractSet[str] = frozenset()
+_NO_EVIDENCE: Tuple[FieldChange, ...] = ()
+
+# Bits of ItemDelta.flags
+FLAG_ADDED = 1           # Item only exists in snapshot B
+FLAG_REMOVED = 2         # Item only exists in snapshot A
+FLAG_QUANTITY = 4
+FLAG_MANUFACTURER = 8
+FLAG_MPN = 16
+FLAG_REFDES = 32
+
+
+def _flag_property(bit: int, doc: str) -> property:
+    """Expose one bit of ItemDelta.flags as a boolean attribute."""
+    def getter(self) -> bool:
+        return bool(self.flags & bit)
+    
+    def setter(self, value: bool) -> None:
+        if value:
+            self.flags |= bit
+        else:
+            self.flags &= ~bit
+    
+    return property(getter, setter, doc=doc)
+
+@dataclass(**DATACLASS_SLOTS)
 class ItemDelta:
     """
     Canonical representation of what changed for a single BOM item.
@@ -121,37 +174,48 @@ class ItemDelta:
     bom_item_id: UUID
     part_id: Optional[UUID] = None
     
-    # Existence flags (mutually exclusive)
-    added: bool = False           # Item only exists in snapshot B
-    removed: bool = False         # Item only exists in snapshot A
-    
-    # Field change flags (computed from FieldChange list)
-    quantity_changed: bool = False
-    manufacturer_changed: bool = False
-    mpn_changed: bool = False
-    reference_designator_changed: bool = False
+    # Bitmask of FLAG_* constants. Existence flags (FLAG_ADDED, FLAG_REMOVED)
+    # are mutually exclusive; the rest are computed from the FieldChange list.
+    flags: int = 0
     
-    # Set of changed attribute names (for SPEC_ATTRIBUTE_CHANGED detection)
-    changed_attributes: Set[str] = field(default_factory=set)
+    # Changed attribute names, split at build time into recognized spec keys
+    # (for SPEC_ATTRIBUTE_CHANGED detection) and everything else.
+    # Empty sets default to a shared frozenset: assign, don't mutate.
+    spec_changed_attributes: AbstractSet[str] = _NO_ATTRIBUTES
+    other_changed_attributes: AbstractSet[str] = _NO_ATTRIBUTES
     
     # Evidence: raw field-level diffs that produced this delta
     # Preserved for audit, explanation, and UI rendering
-    field_changes: List[FieldChange] = field(default_factory=list)
+    field_changes: Sequence[FieldChange] = _NO_EVIDENCE
     
     # Quantity delta details (for downstream use)
     quantity_from: Optional[float] = None
     quantity_to: Optional[float] = None
     
+    # Boolean views of the flag bits
+    added = _flag_property(FLAG_ADDED, "Item only exists in snapshot B")
+    removed = _flag_property(FLAG_REMOVED, "Item only exists in snapshot A")
+    quantity_changed = _flag_property(FLAG_QUANTITY, "Quantity changed")
+    manufacturer_changed = _flag_property(FLAG_MANUFACTURER, "Manufacturer changed")
+    mpn_changed = _flag_property(FLAG_MPN, "MPN changed")
+    reference_designator_changed = _flag_property(FLAG_REFDES, "Reference designator changed")
+    
+    @property
+    def changed_attributes(self) -> AbstractSet[str]:
+        """All changed attribute names (spec and other)."""
+        return self.spec_changed_attributes | self.other_changed_attributes
+    
+    @changed_attributes.setter
+    def changed_attributes(self, names: AbstractSet[str]) -> None:
+        self.spec_changed_attributes = {n for n in names if n in SPEC_ATTRIBUTE_KEYS}
+        self.other_changed_attributes = {n for n in names if n not in SPEC_ATTRIBUTE_KEYS}
+    
     def has_any_change(self) -> bool:
         """Returns True if any change was detected."""
         return (
-            self.added or
-            self.removed or
-            self.quantity_changed or
-            self.manufacturer_changed or
-            self.mpn_changed or
-            self.reference_designator_changed or
-            len(self.changed_attributes) > 0
+            self.flags != 0 or
+            len(self.spec_changed_attributes) > 0 or
+            len(self.other_changed_attributes) > 0
         )
 
 
@@ -160,7 +224,7 @@ class ItemDelta:
 # =============================================================================
 # The final product of classification - what engineers see and act on.
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ChangeEvent:
     """
     A typed, actionable change event.
@@ -185,15 +249,16 @@ class ChangeEvent:
     # Classification
     event_type: ChangeEventType
     severity: Severity
-    affected_domains: List[Domain]
+    affected_domains: Tuple[Domain, ...]  # Shared per event type; do not mutate
     
     # Evidence (non-negotiable)
-    evidence: List[FieldChange]
+    evidence: Sequence[FieldChange]
     
     # Human-readable summary (generated, not computed)
     summary: str = ""
     
-    # Optional: Item delta that produced this event (for debugging)
+    # Optional: Item delta that produced this event (for debugging; only
+    # set by classify_diff(keep_delta=True), never for PART_ADDED / PART_REMOVED)
     delta: Optional[ItemDelta] = None
     
     def to_dict(self) -> Dict[str, Any]:
@@ -201,9 +266,9 @@ class ChangeEvent:
         return {
             "bom_item_id": str(self.bom_item_id),
             "part_id": str(self.part_id) if self.part_id else None,
-            "event_type": self.event_type.name,
-            "severity": self.severity.name,
-            "affected_domains": [d.name for d in self.affected_domains],
+            "event_type": _EVENT_TYPE_NAMES[self.event_type],
+            "severity": _SEVERITY_NAMES[self.severity],
+            "affected_domains": [_DOMAIN_NAMES[d] for d in self.affected_domains],
             "evidence": [
                 {
                     "type": e.type,
@@ -215,13 +280,17 @@ class ChangeEvent:
             ],
             "summary": self.summary
         }
+    
+    def to_json_bytes(self) -> bytes:
+        """Serialize to UTF-8 encoded JSON (uses orjson when installed)."""
+        return _dumps(self.to_dict())
 
 
 # =============================================================================
 # CLASSIFICATION RESULT
 # =============================================================================
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ClassificationResult:
     """
     Complete result of change event classification.
@@ -230,6 +299,9 @@ class ClassificationResult:
     - All classified change events
     - Summary statistics
     - Original diff reference for context
+    
+    The events_by_* filters share indexes built on first use, so events
+    should not be modified after the result has been queried.
     """
     snapshot_a_id: UUID
     snapshot_b_id: UUID
@@ -243,18 +315,49 @@ class ClassificationResult:
     removed_count: int
     modified_count: int
     
+    # Inverted indexes for the events_by_* filters (built lazily)
+    _by_type: Optional[Dict[ChangeEventType, List[ChangeEvent]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _by_severity: Optional[Dict[Severity, List[ChangeEvent]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _by_domain: Optional[Dict[Domain, List[ChangeEvent]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def _build_indexes(self) -> None:
+        """Index events by type, severity and domain in one pass."""
+        by_type = defaultdict(list)
+        by_severity = defaultdict(list)
+        by_domain = defaultdict(list)
+        for event in self.events:
+            by_type[event.event_type].append(event)
+            by_severity[event.severity].append(event)
+            for domain in event.affected_domains:
+                by_domain[domain].append(event)
+        self._by_type = dict(by_type)
+        self._by_severity = dict(by_severity)
+        self._by_domain = dict(by_domain)
+    
     # Events by type (for quick filtering)
     def events_by_type(self, event_type: ChangeEventType) -> List[ChangeEvent]:
         """Filter events by type."""
-        return [e for e in self.events if e.event_type == event_type]
+        if self._by_type is None:
+            self._build_indexes()
+        return list(self._by_type.get(event_type, ()))
     
     def events_by_severity(self, severity: Severity) -> List[ChangeEvent]:
         """Filter events by severity."""
-        return [e for e in self.events if e.severity == severity]
+        if self._by_severity is None:
+            self._build_indexes()
+        return list(self._by_severity.get(severity, ()))
     
     def events_by_domain(self, domain: Domain) -> List[ChangeEvent]:
         """Filter events by affected domain."""
-        return [e for e in self.events if domain in e.affected_domains]
+        if self._by_domain is None:
+            self._build_indexes()
+        return list(self._by_domain.get(domain, ()))
     
     def to_dict(self) -> Dict[str, Any]:
         """Serialize to dictionary for JSON output."""
@@ -267,6 +370,10 @@ class ClassificationResult:
             "modified_count": self.modified_count,
             "events": [e.to_dict() for e in self.events]
         }
+    
+    def to_json_bytes(self) -> bytes:
+        """Serialize to UTF-8 encoded JSON (uses orjson when installed)."""
+        return _dumps(self.to_dict())
 
 
 # =============================================================================
@@ -274,8 +381,11 @@ class ClassificationResult:
 # =============================================================================
 # Transform raw diffs into canonical ItemDelta objects.
 
+# Attribute key sets are immutable and lower-case (field names are
+# lower-cased before substring matching).
+
 # Semantic attribute keys that represent spec changes
-SPEC_ATTRIBUTE_KEYS = {
+SPEC_ATTRIBUTE_KEYS = frozenset({
     "value",
     "tolerance",
     "package",
@@ -287,34 +397,91 @@ SPEC_ATTRIBUTE_KEYS = {
     "temperature_rating",
     "description",
     "unit",
-}
+})
 
 # Manufacturer-related attribute keys
-MANUFACTURER_KEYS = {
+MANUFACTURER_KEYS = frozenset({
     "manufacturer",
     "mfr",
     "vendor",
     "brand",
-}
+})
 
 # MPN-related attribute keys
-MPN_KEYS = {
+MPN_KEYS = frozenset({
     "manufacturer_part_number",
     "mpn",
     "mfr_part_number",
     "part_number",
     "vendor_part_number",
-}
+})
 
 # Reference designator attribute keys
-REFDES_KEYS = {
+REFDES_KEYS = frozenset({
     "reference_designator",
     "refdes",
     "designator",
+})
+
+
+def _key_alternation(keys: AbstractSet[str]) -> str:
+    """Regex alternation of the keys, longest first."""
+    return "|".join(map(re.escape, sorted(keys, key=len, reverse=True)))
+
+
+# Attribute categories in precedence order. MPN is checked FIRST, before
+# manufacturer, since "manufacturer_part_number" contains "manufacturer".
+_CATEGORY_KEYS = (
+    ("mpn", MPN_KEYS),
+    ("mfr", MANUFACTURER_KEYS),
+    ("refdes", REFDES_KEYS),
+    ("spec", SPEC_ATTRIBUTE_KEYS),
+)
+
+# One pattern for the substring fallback. Each branch is a lookahead anchored
+# at the start that finds a key anywhere in the name, followed by an empty
+# named group. Branches are tried in precedence order, so the group that
+# matches is the first category with a contained key - not the category
+# whose key happens to occur earliest in the string.
+_CATEGORY_RE = re.compile(
+    "|".join(
+        f"(?=.*?(?:{_key_alternation(keys)}))(?P<{category}>)"
+        for category, keys in _CATEGORY_KEYS
+    ),
+    re.DOTALL,
+)
+
+
+def _match_category(field_lower: str) -> Optional[str]:
+    """Return the first category with a key contained in the (lower-cased) field name."""
+    match = _CATEGORY_RE.match(field_lower)
+    return match.lastgroup if match else None
+
+
+# Exact-key fast path, built with the same precedence as the substring fallback
+_EXACT_KEY_CATEGORY = {
+    key: _match_category(key)
+    for key in MPN_KEYS | MANUFACTURER_KEYS | REFDES_KEYS | SPEC_ATTRIBUTE_KEYS
 }
 
 
-def _compute_item_delta_from_modified(modified: ModifiedItem) -> ItemDelta:
+def _field_category(field_name: str) -> Optional[str]:
+    """Categorize an attribute field name (case-insensitive)."""
+    field_lower = field_name.lower()
+    category = _EXACT_KEY_CATEGORY.get(field_lower)
+    if category is None:
+        category = _match_category(field_lower)
+    return category
+
+
+# FieldChange types that carry an attribute name
+_ATTR_CHANGE_TYPES = frozenset({"ATTRIBUTE_CHANGED", "ATTRIBUTE_ADDED", "ATTRIBUTE_REMOVED"})
+
+
+def _compute_item_delta_from_modified(
+    modified: ModifiedItem,
+    field_categories: Optional[Dict[str, Tuple[str, Optional[str]]]] = None
+) -> ItemDelta:
     """
     Compute an ItemDelta from a ModifiedItem.
     
@@ -323,49 +490,67 @@ def _compute_item_delta_from_modified(modified: ModifiedItem) -> ItemDelta:
     
     Args:
         modified: ModifiedItem from Layer 1 diff
+        field_categories: Optional memo of field name -> (interned name,
+            category), shared across items so each distinct field name is
+            categorized once and stored as a single string object
         
     Returns:
         ItemDelta with all flags computed
     """
-    delta = ItemDelta(
-        bom_item_id=modified.bom_item_id,
-        field_changes=modified.changes
-    )
+    if field_categories is None:
+        field_categories = {}
+    flags = 0
+    quantity_from = quantity_to = None
+    # Sets are only allocated once an attribute of that kind is seen
+    spec_changed_attributes = other_changed_attributes = _NO_ATTRIBUTES
     
     for change in modified.changes:
+        change_type = change.type
+        
         # Quantity change
-        if change.type == "QUANTITY_CHANGED":
-            delta.quantity_changed = True
-            delta.quantity_from = change.from_value
-            delta.quantity_to = change.to_value
+        if change_type == "QUANTITY_CHANGED":
+            flags |= FLAG_QUANTITY
+            quantity_from = change.from_value
+            quantity_to = change.to_value
         
         # Attribute changes
-        elif change.type in ("ATTRIBUTE_CHANGED", "ATTRIBUTE_ADDED", "ATTRIBUTE_REMOVED"):
+        elif change_type in _ATTR_CHANGE_TYPES:
             field_name = change.field
-            if field_name:
-                field_lower = field_name.lower()
-                
-                # Check for MPN change FIRST (before manufacturer, since "manufacturer_part_number" contains "manufacturer")
-                if field_lower in MPN_KEYS or any(k in field_lower for k in MPN_KEYS):
-                    delta.mpn_changed = True
-                
-                # Check for manufacturer change (after MPN to avoid false matches)
-                elif field_lower in MANUFACTURER_KEYS or any(k in field_lower for k in MANUFACTURER_KEYS):
-                    delta.manufacturer_changed = True
-                
-                # Check for reference designator change
-                elif field_lower in REFDES_KEYS or any(k in field_lower for k in REFDES_KEYS):
-                    delta.reference_designator_changed = True
-                
-                # Check for spec attribute change
-                elif field_lower in SPEC_ATTRIBUTE_KEYS or any(k in field_lower for k in SPEC_ATTRIBUTE_KEYS):
-                    delta.changed_attributes.add(field_name)
-                
-                # Unknown attribute - still track it
-                else:
-                    delta.changed_attributes.add(field_name)
-    
-    return delta
+            if not field_name:
+                continue
+            
+            cached = field_categories.get(field_name)
+            if cached is None:
+                cached = field_categories[field_name] = (
+                    sys.intern(field_name), _field_category(field_name)
+                )
+            field_name, category = cached
+            
+            if category == "mpn":
+                flags |= FLAG_MPN
+            elif category == "mfr":
+                flags |= FLAG_MANUFACTURER
+            elif category == "refdes":
+                flags |= FLAG_REFDES
+            # Spec attribute, or unknown attribute - still track it
+            elif field_name in SPEC_ATTRIBUTE_KEYS:
+                if spec_changed_attributes is _NO_ATTRIBUTES:
+                    spec_changed_attributes = set()
+                spec_changed_attributes.add(field_name)
+            else:
+                if other_changed_attributes is _NO_ATTRIBUTES:
+                    other_changed_attributes = set()
+                other_changed_attributes.add(field_name)
+    
+    return ItemDelta(
+        bom_item_id=modified.bom_item_id,
+        flags=flags,
+        spec_changed_attributes=spec_changed_attributes,
+        other_changed_attributes=other_changed_attributes,
+        field_changes=modified.changes,
+        quantity_from=quantity_from,
+        quantity_to=quantity_to
+    )
 
 
 def _compute_item_delta_added(bom_item_id: UUID) -> ItemDelta:
@@ -380,7 +565,7 @@ def _compute_item_delta_added(bom_item_id: UUID) -> ItemDelta:
     """
     return ItemDelta(
         bom_item_id=bom_item_id,
-        added=True
+        flags=FLAG_ADDED
     )
 
 
@@ -396,7 +581,7 @@ def _compute_item_delta_removed(bom_item_id: UUID) -> ItemDelta:
     """
     return ItemDelta(
         bom_item_id=bom_item_id,
-        removed=True
+        flags=FLAG_REMOVED
     )
 
 
@@ -406,6 +591,65 @@ def _compute_item_delta_removed(bom_item_id: UUID) -> ItemDelta:
 # Ordered, explicit rules. First match wins.
 # Each rule is a function: (ItemDelta) -> Optional[ChangeEvent]
 
+# Fixed attributes per event type: (severity, affected domains, default summary)
+_EVENT_TEMPLATES: Dict[ChangeEventType, Tuple[Severity, Tuple[Domain, ...], str]] = {
+    ChangeEventType.PART_ADDED: (
+        Severity.HIGH, (Domain.ENGINEERING, Domain.PROCUREMENT),
+        "New part added to BOM"),
+    ChangeEventType.PART_REMOVED: (
+        Severity.HIGH, (Domain.ENGINEERING, Domain.PROCUREMENT),
+        "Part removed from BOM"),
+    ChangeEventType.PART_SUBSTITUTED: (
+        Severity.HIGH, (Domain.PROCUREMENT, Domain.ENGINEERING),
+        "Part substituted (different manufacturer and MPN)"),
+    ChangeEventType.MANUFACTURER_CHANGED: (
+        Severity.MEDIUM, (Domain.PROCUREMENT,),
+        "Manufacturer changed"),
+    ChangeEventType.QUANTITY_CHANGED: (
+        Severity.MEDIUM, (Domain.PROCUREMENT, Domain.MANUFACTURING),
+        "Quantity changed"),
+    ChangeEventType.REFERENCE_DESIGNATOR_CHANGED: (
+        Severity.LOW, (Domain.MANUFACTURING,),
+        "Reference designator changed"),
+    ChangeEventType.SPEC_ATTRIBUTE_CHANGED: (
+        Severity.MEDIUM, (Domain.ENGINEERING,),
+        "Specification changed"),
+    ChangeEventType.UNCLASSIFIED_CHANGE: (
+        Severity.LOW, (),  # Unknown domains
+        "Unclassified change"),
+}
+
+
+def _make_event(
+    delta: ItemDelta,
+    event_type: ChangeEventType,
+    summary: Optional[str] = None
+) -> ChangeEvent:
+    """Build a ChangeEvent for a delta from its event type's template."""
+    severity, domains, default_summary = _EVENT_TEMPLATES[event_type]
+    return ChangeEvent(
+        delta.bom_item_id,
+        delta.part_id,
+        event_type,
+        severity,
+        domains,
+        delta.field_changes,
+        default_summary if summary is None else summary,
+        delta
+    )
+
+
+def _make_existence_event(bom_item_id: UUID, event_type: ChangeEventType) -> ChangeEvent:
+    """
+    Build a PART_ADDED / PART_REMOVED event without an intermediate ItemDelta.
+    
+    Existence changes carry no field-level information, so the delta would
+    only hold the single flag that selects the event type.
+    """
+    severity, domains, summary = _EVENT_TEMPLATES[event_type]
+    return ChangeEvent(bom_item_id, None, event_type, severity, domains, _NO_EVIDENCE, summary)
+
+
 def _classify_added(delta: ItemDelta) -> Optional[ChangeEvent]:
     """
     Rule: Item only exists in snapshot B.
@@ -415,16 +659,7 @@ def _classify_added(delta: ItemDelta) -> Optional[ChangeEvent]:
     if not delta.added:
         return None
     
-    return ChangeEvent(
-        bom_item_id=delta.bom_item_id,
-        part_id=delta.part_id,
-        event_type=ChangeEventType.PART_ADDED,
-        severity=Severity.HIGH,
-        affected_domains=[Domain.ENGINEERING, Domain.PROCUREMENT],
-        evidence=delta.field_changes,
-        summary="New part added to BOM",
-        delta=delta
-    )
+    return _make_event(delta, ChangeEventType.PART_ADDED)
 
 
 def _classify_removed(delta: ItemDelta) -> Optional[ChangeEvent]:
@@ -436,16 +671,7 @@ def _classify_removed(delta: ItemDelta) -> Optional[ChangeEvent]:
     if not delta.removed:
         return None
     
-    return ChangeEvent(
-        bom_item_id=delta.bom_item_id,
-        part_id=delta.part_id,
-        event_type=ChangeEventType.PART_REMOVED,
-        severity=Severity.HIGH,
-        affected_domains=[Domain.ENGINEERING, Domain.PROCUREMENT],
-        evidence=delta.field_changes,
-        summary="Part removed from BOM",
-        delta=delta
-    )
+    return _make_event(delta, ChangeEventType.PART_REMOVED)
 
 
 def _classify_substituted(delta: ItemDelta) -> Optional[ChangeEvent]:
@@ -460,16 +686,7 @@ def _classify_substituted(delta: ItemDelta) -> Optional[ChangeEvent]:
     if not (delta.manufacturer_changed and delta.mpn_changed):
         return None
     
-    return ChangeEvent(
-        bom_item_id=delta.bom_item_id,
-        part_id=delta.part_id,
-        event_type=ChangeEventType.PART_SUBSTITUTED,
-        severity=Severity.HIGH,
-        affected_domains=[Domain.PROCUREMENT, Domain.ENGINEERING],
-        evidence=delta.field_changes,
-        summary="Part substituted (different manufacturer and MPN)",
-        delta=delta
-    )
+    return _make_event(delta, ChangeEventType.PART_SUBSTITUTED)
 
 
 def _classify_manufacturer_changed(delta: ItemDelta) -> Optional[ChangeEvent]:
@@ -490,16 +707,16 @@ def _classify_manufacturer_changed(delta: ItemDelta) -> Optional[ChangeEvent]:
     if delta.mpn_changed:
         return None
     
-    return ChangeEvent(
-        bom_item_id=delta.bom_item_id,
-        part_id=delta.part_id,
-        event_type=ChangeEventType.MANUFACTURER_CHANGED,
-        severity=Severity.MEDIUM,
-        affected_domains=[Domain.PROCUREMENT],
-        evidence=delta.field_changes,
-        summary="Manufacturer changed",
-        delta=delta
-    )
+    return _make_event(delta, ChangeEventType.MANUFACTURER_CHANGED)
+
+
+def _fmt_qty(quantity: Any) -> Any:
+    """Drop the fractional part of whole-number quantities for display (5.0 -> 5)."""
+    if isinstance(quantity, float):
+        # Layer 1 reports quantities as floats; is_integer() is a single check
+        # and leaves inf/nan as-is instead of failing in int()
+        return int(quantity) if quantity.is_integer() else quantity
+    return int(quantity) if quantity == int(quantity) else quantity
 
 
 def _classify_quantity_changed(delta: ItemDelta) -> Optional[ChangeEvent]:
@@ -515,22 +732,11 @@ def _classify_quantity_changed(delta: ItemDelta) -> Optional[ChangeEvent]:
     
     # Build summary with delta details
     if delta.quantity_from is not None and delta.quantity_to is not None:
-        qty_from = int(delta.quantity_from) if delta.quantity_from == int(delta.quantity_from) else delta.quantity_from
-        qty_to = int(delta.quantity_to) if delta.quantity_to == int(delta.quantity_to) else delta.quantity_to
-        summary = f"Quantity changed: {qty_from} → {qty_to}"
+        summary = f"Quantity changed: {_fmt_qty(delta.quantity_from)} → {_fmt_qty(delta.quantity_to)}"
     else:
-        summary = "Quantity changed"
+        summary = None  # Template default
     
-    return ChangeEvent(
-        bom_item_id=delta.bom_item_id,
-        part_id=delta.part_id,
-        event_type=ChangeEventType.QUANTITY_CHANGED,
-        severity=Severity.MEDIUM,
-        affected_domains=[Domain.PROCUREMENT, Domain.MANUFACTURING],
-        evidence=delta.field_changes,
-        summary=summary,
-        delta=delta
-    )
+    return _make_event(delta, ChangeEventType.QUANTITY_CHANGED, summary)
 
 
 def _classify_refdes_changed(delta: ItemDelta) -> Optional[ChangeEvent]:
@@ -545,16 +751,7 @@ def _classify_refdes_changed(delta: ItemDelta) -> Optional[ChangeEvent]:
     if not delta.reference_designator_changed:
         return None
     
-    return ChangeEvent(
-        bom_item_id=delta.bom_item_id,
-        part_id=delta.part_id,
-        event_type=ChangeEventType.REFERENCE_DESIGNATOR_CHANGED,
-        severity=Severity.LOW,
-        affected_domains=[Domain.MANUFACTURING],
-        evidence=delta.field_changes,
-        summary="Reference designator changed",
-        delta=delta
-    )
+    return _make_event(delta, ChangeEventType.REFERENCE_DESIGNATOR_CHANGED)
 
 
 def _classify_spec_attribute_changed(delta: ItemDelta) -> Optional[ChangeEvent]:
@@ -566,11 +763,8 @@ def _classify_spec_attribute_changed(delta: ItemDelta) -> Optional[ChangeEvent]:
     
     Produces: SPEC_ATTRIBUTE_CHANGED (MEDIUM severity)
     """
-    if not delta.changed_attributes:
-        return None
-    
-    # Filter to only spec-like attributes
-    spec_changes = delta.changed_attributes & SPEC_ATTRIBUTE_KEYS
+    # Only recognized spec attributes (filtered when the delta was built)
+    spec_changes = delta.spec_changed_attributes
     
     if not spec_changes:
         # Changed attributes are not recognized spec attributes
@@ -581,16 +775,7 @@ def _classify_spec_attribute_changed(delta: ItemDelta) -> Optional[ChangeEvent]:
     attrs_list = ", ".join(sorted(spec_changes))
     summary = f"Specification changed: {attrs_list}"
     
-    return ChangeEvent(
-        bom_item_id=delta.bom_item_id,
-        part_id=delta.part_id,
-        event_type=ChangeEventType.SPEC_ATTRIBUTE_CHANGED,
-        severity=Severity.MEDIUM,
-        affected_domains=[Domain.ENGINEERING],
-        evidence=delta.field_changes,
-        summary=summary,
-        delta=delta
-    )
+    return _make_event(delta, ChangeEventType.SPEC_ATTRIBUTE_CHANGED, summary)
 
 
 def _classify_unclassified(delta: ItemDelta) -> Optional[ChangeEvent]:
@@ -607,26 +792,18 @@ def _classify_unclassified(delta: ItemDelta) -> Optional[ChangeEvent]:
     
     # Build summary describing what changed
     changes_desc = []
-    if delta.changed_attributes:
-        changes_desc.append(f"attributes: {', '.join(sorted(delta.changed_attributes))}")
+    changed_attributes = delta.changed_attributes
+    if changed_attributes:
+        changes_desc.append(f"attributes: {', '.join(sorted(changed_attributes))}")
     if delta.mpn_changed:
         changes_desc.append("MPN")
     
     if changes_desc:
         summary = f"Unclassified change: {'; '.join(changes_desc)}"
     else:
-        summary = "Unclassified change"
+        summary = None  # Template default
     
-    return ChangeEvent(
-        bom_item_id=delta.bom_item_id,
-        part_id=delta.part_id,
-        event_type=ChangeEventType.UNCLASSIFIED_CHANGE,
-        severity=Severity.LOW,
-        affected_domains=[],  # Unknown domains
-        evidence=delta.field_changes,
-        summary=summary,
-        delta=delta
-    )
+    return _make_event(delta, ChangeEventType.UNCLASSIFIED_CHANGE, summary)
 
 
 # Ordered list of classification rules
@@ -643,6 +820,64 @@ CLASSIFICATION_RULES = [
 ]
 
 
+# Classification state: the six FLAG_* bits plus whether the delta has
+# recognized spec attributes and/or other attributes. Every rule decision
+# depends only on this state, so the matching rule can be precomputed.
+_STATE_SPEC = 64
+_STATE_OTHER = 128
+
+
+_Rule = Callable[[ItemDelta], Optional[ChangeEvent]]
+
+
+def _build_rule_table() -> List[Optional[_Rule]]:
+    """
+    Precompute the first matching rule for every classification state.
+    
+    The table is derived by running CLASSIFICATION_RULES on a representative
+    delta for each state, so the rule list stays the single source of truth.
+    """
+    table: List[Optional[_Rule]] = []
+    for state in range(_STATE_OTHER * 2):
+        delta = ItemDelta(bom_item_id=None, flags=state & (_STATE_SPEC - 1))
+        if state & _STATE_SPEC:
+            delta.spec_changed_attributes = {"value"}
+        if state & _STATE_OTHER:
+            delta.other_changed_attributes = {"_other"}
+        
+        matched = None
+        if delta.has_any_change():
+            for rule in CLASSIFICATION_RULES:
+                if rule(delta) is not None:
+                    matched = rule
+                    break
+        table.append(matched)
+    return table
+
+
+_RULE_TABLE = _build_rule_table()
+
+
+def _classify_delta_fast(delta: ItemDelta) -> Optional[ChangeEvent]:
+    """
+    Table-driven equivalent of applying CLASSIFICATION_RULES in order.
+    
+    Looks up the rule that matches the delta's classification state and
+    calls only that rule.
+    """
+    state = delta.flags
+    if delta.spec_changed_attributes:
+        state |= _STATE_SPEC
+    if delta.other_changed_attributes:
+        state |= _STATE_OTHER
+    
+    rule = _RULE_TABLE[state]
+    if rule is None:
+        # No change detected
+        return None
+    return rule(delta)
+
+
 def _classify_delta(delta: ItemDelta) -> Optional[ChangeEvent]:
     """
     Classify a single ItemDelta into a ChangeEvent.
@@ -656,24 +891,14 @@ def _classify_delta(delta: ItemDelta) -> Optional[ChangeEvent]:
     Returns:
         ChangeEvent if classification succeeds, None if no change
     """
-    if not delta.has_any_change():
-        return None
-    
-    for rule in CLASSIFICATION_RULES:
-        event = rule(delta)
-        if event is not None:
-            return event
-    
-    # Should never reach here if rules are complete
-    # (UNCLASSIFIED always matches if has_any_change())
-    return None
+    return _classify_delta_fast(delta)
 
 
 # =============================================================================
 # MAIN CLASSIFICATION FUNCTION
 # =============================================================================
 
-def classify_diff(diff_result: DiffResult) -> ClassificationResult:
+def classify_diff(diff_result: DiffResult, keep_delta: bool = False) -> ClassificationResult:
     """
     Classify a DiffResult into typed ChangeEvents.
     
@@ -691,6 +916,9 @@ def classify_diff(diff_result: DiffResult) -> ClassificationResult:
     
     Args:
         diff_result: The DiffResult from Layer 1 diff engine
+        keep_delta: Attach the ItemDelta to each modified-item event (for
+            debugging). Off by default, since the delta duplicates the
+            evidence and is otherwise dropped right after classification.
         
     Returns:
         ClassificationResult with all classified events
@@ -702,28 +930,27 @@ def classify_diff(diff_result: DiffResult) -> ClassificationResult:
         >>> for event in result.events:
         ...     print(f"{event.event_type.name}: {event.summary}")
     """
-    events: List[ChangeEvent] = []
-    
-    # Process added items
-    for bom_item_id in diff_result.added_items:
-        delta = _compute_item_delta_added(bom_item_id)
-        event = _classify_delta(delta)
-        if event:
-            events.append(event)
-    
-    # Process removed items
-    for bom_item_id in diff_result.removed_items:
-        delta = _compute_item_delta_removed(bom_item_id)
-        event = _classify_delta(delta)
-        if event:
-            events.append(event)
+    # Process added and removed items
+    events: List[ChangeEvent] = [
+        _make_existence_event(bom_item_id, ChangeEventType.PART_ADDED)
+        for bom_item_id in diff_result.added_items
+    ]
+    events.extend(
+        _make_existence_event(bom_item_id, ChangeEventType.PART_REMOVED)
+        for bom_item_id in diff_result.removed_items
+    )
     
-    # Process modified items
+    # Process modified items, categorizing each distinct field name once
+    field_categories: Dict[str, Tuple[str, Optional[str]]] = {}
+    append_event = events.append
+    compute_delta = _compute_item_delta_from_modified
+    classify = _classify_delta_fast
     for modified in diff_result.modified_items:
-        delta = _compute_item_delta_from_modified(modified)
-        event = _classify_delta(delta)
-        if event:
-            events.append(event)
+        event = classify(compute_delta(modified, field_categories))
+        if event is not None:
+            if not keep_delta:
+                event.delta = None
+            append_event(event)
     
     return ClassificationResult(
         snapshot_a_id=diff_result.snapshot_a_id,
@@ -754,24 +981,19 @@ def classify_and_summarize(diff_result: DiffResult) -> Dict[str, Any]:
     """
     result = classify_diff(diff_result)
     
-    # Count events by type
-    by_type = {}
-    for event in result.events:
-        type_name = event.event_type.name
-        by_type[type_name] = by_type.get(type_name, 0) + 1
-    
-    # Count events by severity
-    by_severity = {}
+    # Count events by type and severity in one pass
+    by_type: Counter = Counter()
+    by_severity: Counter = Counter()
     for event in result.events:
-        sev_name = event.severity.name
-        by_severity[sev_name] = by_severity.get(sev_name, 0) + 1
+        by_type[_EVENT_TYPE_NAMES[event.event_type]] += 1
+        by_severity[_SEVERITY_NAMES[event.severity]] += 1
     
     return {
         "snapshot_a_id": str(result.snapshot_a_id),
         "snapshot_b_id": str(result.snapshot_b_id),
         "total_events": result.total_changes,
-        "events_by_type": by_type,
-        "events_by_severity": by_severity,
+        "events_by_type": dict(by_type),
+        "events_by_severity": dict(by_severity),
         "high_severity_count": by_severity.get("HIGH", 0),
         "events": [e.to_dict() for e in result.events]
     }
@@ -18,16 +18,36 @@ CORE PRINCIPLES:
 4. Non-semantic metadata must NEVER appear in diffs
 """
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Any, Union, Tuple
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Any, Union, Tuple
 from uuid import UUID
+from operator import attrgetter, itemgetter
+from sys import intern
 import json
-import hashlib
+import math
+import threading
 
+try:
+    # Optional fast JSON encoder for semantic keys; falls back to the stdlib json
+    import orjson
+except ImportError:
+    orjson = None
+
+from .._compat import DATACLASS_SLOTS
 from ..ingest.snapshot_ingest import DatabaseClient, NON_SEMANTIC_ATTRIBUTE_KEYS, _filter_semantic_attributes
 
+_uuid_int = attrgetter('int')
+
+# Snapshots are immutable once ingested, so the diff of two snapshot ids never
+# changes; repeated requests (UI, audit) are served from this LRU cache
+DIFF_CACHE_SIZE = 1024
+_diff_cache: "OrderedDict[Tuple[UUID, UUID], DiffResult]" = OrderedDict()
+_diff_cache_lock = threading.Lock()
+
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class SnapshotItemState:
     """
     Represents the state of a single bom_item in a snapshot.
@@ -40,9 +60,13 @@ class SnapshotItemState:
     attributes: Dict[str, Any]
     checksum: str
     part_id: Optional[UUID] = None  # Part ID for semantic matching
+    attributes_checksum: Optional[str] = None  # Semantic attributes only (None if not stored)
+    semantic_key: Optional[str] = None  # Semantic matching key from ingest (None if not stored)
+    # Filtered attributes, computed on first use by _semantic_attributes()
+    semantic_attributes: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class FieldChange:
     """
     Represents a single field-level change in a snapshot item.
@@ -55,18 +79,18 @@ class FieldChange:
     to_value: Any
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ModifiedItem:
     """
     Represents a bom_item that changed between snapshots.
     
-    Contains the bom_item_id and the list of field-level changes.
+    Contains the bom_item_id and the field-level changes.
     """
     bom_item_id: UUID
-    changes: List[FieldChange]
+    changes: Tuple[FieldChange, ...]
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class DiffResult:
     """
     Complete diff result between two snapshots.
@@ -76,63 +100,132 @@ class DiffResult:
     - LLM summarization
     - Impact analysis
     - Audit logging
+    
+    The result and its items are immutable (tuples of frozen dataclasses) so
+    it can be cached and shared without callers copying it defensively.
+    Attribute values in FieldChange.from_value/to_value are still shared
+    objects and must not be mutated.
     """
     snapshot_a_id: UUID
     snapshot_b_id: UUID
-    added_items: List[UUID]  # bom_item_ids that exist in B but not A
-    removed_items: List[UUID]  # bom_item_ids that exist in A but not B
-    modified_items: List[ModifiedItem]  # bom_item_ids that changed
+    added_items: Tuple[UUID, ...]  # bom_item_ids that exist in B but not A
+    removed_items: Tuple[UUID, ...]  # bom_item_ids that exist in A but not B
+    modified_items: Tuple[ModifiedItem, ...]  # bom_item_ids that changed
     unchanged_count: int  # bom_item_ids that are identical in both
 
 
-def _create_semantic_key(part_id: Optional[UUID], quantity: Optional[Union[int, float]], attributes: Dict[str, Any]) -> str:
+def _semantic_attributes_json(semantic_attrs: Dict[str, Any]) -> Union[str, bytes]:
+    """
+    Serialize semantic attributes canonically (sorted keys) for a semantic key.
+    
+    Keys are only compared within one diff, so the orjson bytes and stdlib str
+    forms never need to agree; equal attributes always take the same path.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(semantic_attrs, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            # Non-str keys or values orjson rejects (e.g. ints over 64 bits)
+            pass
+    return json.dumps(semantic_attrs, sort_keys=True)
+
+
+def _semantic_attributes(state: SnapshotItemState) -> Dict[str, Any]:
+    """
+    Get the semantic attributes of a state, filtering them only once.
+    
+    Both semantic matching and the field-level diff need the filtered dict;
+    it is cached on the state so an item that goes through both is filtered
+    a single time.
+    """
+    attributes = state.semantic_attributes
+    if attributes is None:
+        attributes = state.attributes
+        if attributes:
+            attributes = _filter_semantic_attributes(attributes)
+        state.semantic_attributes = attributes
+    return attributes
+
+
+def _create_semantic_key(
+    part_id: Optional[UUID],
+    quantity: Optional[Union[int, float]],
+    attributes: Dict[str, Any]
+) -> Tuple[Optional[UUID], Optional[str], Union[str, bytes]]:
     """
     Create a semantic key for matching items across snapshots.
     
     Uses part_id + quantity + semantic attributes to identify the same logical item
     even if it has a different bom_item_id.
     
+    The key is only used for in-memory bucketing, so it is returned as a tuple
+    for dicts to hash directly. Quantity is kept as str(quantity) so 2 and
+    2.0 stay distinct, and attributes are serialized because their values may
+    be unhashable (lists, dicts).
+    
     Args:
         part_id: Part ID (None if not available)
         quantity: Quantity
         attributes: Attributes dict (will be filtered to semantic only)
         
     Returns:
-        String key for semantic matching
+        Hashable key for semantic matching
     """
     # Filter to semantic attributes only
     semantic_attrs = _filter_semantic_attributes(attributes)
     
-    # Create a stable representation
-    key_parts = [
-        str(part_id) if part_id else "NO_PART",
-        str(quantity) if quantity is not None else "NO_QTY",
-        json.dumps(semantic_attrs, sort_keys=True) if semantic_attrs else "{}"
-    ]
+    return (
+        part_id if part_id else None,
+        str(quantity) if quantity is not None else None,
+        _semantic_attributes_json(semantic_attrs) if semantic_attrs else "{}"
+    )
+
+
+# Absolute tolerance for quantity comparison: float round-trips through the DB
+# numeric column must not show up as QUANTITY_CHANGED
+QUANTITY_ABS_TOL = 1e-12
+
+
+def _quantity_changed(
+    quantity_a: Optional[Union[int, float]],
+    quantity_b: Optional[Union[int, float]]
+) -> bool:
+    """
+    Check whether two quantities differ semantically.
     
-    # Hash for consistent key format
-    key_str = "|".join(key_parts)
-    return hashlib.md5(key_str.encode()).hexdigest()
+    None only equals None; numbers are compared with QUANTITY_ABS_TOL so 1,
+    1.0 and 1.0000000000001 are the same quantity.
+    """
+    if quantity_a is None or quantity_b is None:
+        return quantity_a is not quantity_b
+    if quantity_a == quantity_b:
+        return False
+    return not math.isclose(quantity_a, quantity_b, rel_tol=0.0, abs_tol=QUANTITY_ABS_TOL)
 
 
-def _create_part_based_key(part_id: Optional[UUID]) -> str:
+def _create_part_based_key(part_id: Optional[UUID]) -> Optional[UUID]:
     """
     Create a key based only on part_id for matching items that represent the same part
     but may have different quantities or attributes (these should be modified, not removed+added).
     
+    The UUID itself is the key (no string conversion); items without a part
+    share the None key.
+    
     Args:
         part_id: Part ID (None if not available)
         
     Returns:
-        String key for part-based matching
+        Hashable key for part-based matching
     """
-    return str(part_id) if part_id else "NO_PART"
+    return part_id if part_id else None
 
 
 def fetch_snapshot_state(
     db: DatabaseClient,
     snapshot_id: UUID,
-    bom_item_details: Optional[Dict[UUID, Dict[str, Any]]] = None
+    bom_item_details: Optional[Dict[UUID, Dict[str, Any]]] = None,
+    snapshot_items: Optional[List[Dict[str, Any]]] = None,
+    part_ids: Optional[Dict[UUID, Optional[UUID]]] = None
 ) -> Dict[UUID, SnapshotItemState]:
     """
     Fetch all snapshot items for a snapshot and represent as identity-keyed dict.
@@ -147,46 +240,71 @@ def fetch_snapshot_state(
         db: Database client
         snapshot_id: Snapshot ID to fetch
         bom_item_details: Optional pre-fetched bom_item details dict (for performance)
+        snapshot_items: Optional pre-fetched rows from db.get_snapshot_items()
+            (avoids fetching the snapshot a second time)
+        part_ids: Optional pre-fetched bom_item_id -> part_id mapping, as
+            returned by db.get_bom_item_part_ids() (takes precedence over
+            bom_item_details)
         
     Returns:
         Dictionary mapping bom_item_id -> SnapshotItemState
     """
-    snapshot_items = db.get_snapshot_items(snapshot_id)
+    if snapshot_items is None:
+        snapshot_items = db.get_snapshot_items(snapshot_id)
+    
+    # Parse bom_item_ids once (clients may return them already parsed); they
+    # are needed both for the details lookup and as state keys
+    bom_item_ids = [
+        bom_item_id if isinstance(bom_item_id, UUID) else UUID(bom_item_id)
+        for bom_item_id in map(itemgetter('bom_item_id'), snapshot_items)
+    ]
     
-    # If bom_item_details not provided, fetch them
-    if bom_item_details is None:
-        bom_item_ids = [UUID(item['bom_item_id']) for item in snapshot_items]
-        if bom_item_ids:
-            bom_item_details = db.get_bom_item_details(bom_item_ids)
-        else:
-            bom_item_details = {}
+    # Only part_id is read from the details, so reduce them to a flat mapping
+    if part_ids is None:
+        # If bom_item_details not provided, fetch them
+        if bom_item_details is None:
+            if bom_item_ids:
+                bom_item_details = db.get_bom_item_details(bom_item_ids)
+            else:
+                bom_item_details = {}
+        part_ids = {
+            bom_item_id: details.get('part_id')
+            for bom_item_id, details in bom_item_details.items()
+        }
+    get_part_id = part_ids.get
     
     state = {}
-    for item in snapshot_items:
-        bom_item_id = UUID(item['bom_item_id'])
-        
-        # Get part_id from bom_item_details
-        details = bom_item_details.get(bom_item_id, {})
-        part_id = details.get('part_id')
+    for bom_item_id, item in zip(bom_item_ids, snapshot_items):
+        part_id = get_part_id(bom_item_id)
         if part_id:
             part_id = UUID(part_id) if isinstance(part_id, str) else part_id
         
         # Handle quantity conversion (DB may return numeric as Decimal, int, or float)
+        # int is preserved: the semantic key is built from str(quantity)
         quantity = item['quantity']
-        if quantity is not None:
-            # Convert to numeric type (preserve int if possible, else float)
-            if isinstance(quantity, (int, float)):
-                quantity = quantity
-            else:
-                # Handle Decimal or string
-                quantity = float(quantity)
+        if quantity is not None and not isinstance(quantity, (int, float)):
+            # Handle Decimal or string
+            quantity = float(quantity)
+        
+        # Intern attribute keys: the same few names repeat on every row, and
+        # interned keys let dict lookups and comparisons match on identity
+        attributes = item['attributes']
+        if attributes:
+            attributes = {
+                intern(k) if isinstance(k, str) else k: v
+                for k, v in attributes.items()
+            }
+        else:
+            attributes = {}
         
         state[bom_item_id] = SnapshotItemState(
             bom_item_id=bom_item_id,
             quantity=quantity,
-            attributes=item['attributes'] or {},
+            attributes=attributes,
             checksum=item['checksum'],
-            part_id=part_id
+            part_id=part_id,
+            attributes_checksum=item.get('attributes_checksum'),
+            semantic_key=item.get('semantic_key')
         )
     
     return state
@@ -215,44 +333,40 @@ def diff_snapshot_item(
     changes = []
     
     # Compare quantity (always semantic)
-    if a.quantity != b.quantity:
+    # (fetch_snapshot_state already turned Decimal/str into float, so only
+    # preserved ints still need converting for the report)
+    quantity_a = a.quantity
+    quantity_b = b.quantity
+    if _quantity_changed(quantity_a, quantity_b):
         changes.append(FieldChange(
             type="QUANTITY_CHANGED",
             field=None,
-            from_value=float(a.quantity) if a.quantity is not None else None,
-            to_value=float(b.quantity) if b.quantity is not None else None
+            from_value=float(quantity_a) if isinstance(quantity_a, int) else quantity_a,
+            to_value=float(quantity_b) if isinstance(quantity_b, int) else quantity_b
         ))
     
+    # Quantity-only change: the stored attribute checksums already say the
+    # semantic attributes are equal
+    if a.attributes_checksum is not None and a.attributes_checksum == b.attributes_checksum:
+        return changes
+    
+    # Identical raw attributes cannot differ once filtered (common for
+    # quantity-only changes)
+    if a.attributes is b.attributes or a.attributes == b.attributes:
+        return changes
+    
     # Filter non-semantic attributes before comparison
     # This ensures row_index, normalization artifacts never appear in diffs
-    attrs_a = _filter_semantic_attributes(a.attributes)
-    attrs_b = _filter_semantic_attributes(b.attributes)
+    attrs_a = _semantic_attributes(a)
+    attrs_b = _semantic_attributes(b)
     
     # Compare only semantic attributes (field-by-field)
-    all_keys = set(attrs_a.keys()) | set(attrs_b.keys())
-    
-    for key in all_keys:
-        val_a = attrs_a.get(key)
-        val_b = attrs_b.get(key)
-        
-        if val_a != val_b:
-            if key not in attrs_a:
-                # Attribute was added
-                changes.append(FieldChange(
-                    type="ATTRIBUTE_ADDED",
-                    field=key,
-                    from_value=None,
-                    to_value=val_b
-                ))
-            elif key not in attrs_b:
-                # Attribute was removed
-                changes.append(FieldChange(
-                    type="ATTRIBUTE_REMOVED",
-                    field=key,
-                    from_value=val_a,
-                    to_value=None
-                ))
-            else:
+    # Walks each dict once instead of building the union of their keys; a
+    # key missing on one side compares like a None value.
+    for key, val_a in attrs_a.items():
+        if key in attrs_b:
+            val_b = attrs_b[key]
+            if val_a != val_b:
                 # Attribute was modified
                 changes.append(FieldChange(
                     type="ATTRIBUTE_CHANGED",
@@ -260,14 +374,39 @@ def diff_snapshot_item(
                     from_value=val_a,
                     to_value=val_b
                 ))
+        elif val_a is not None:
+            # Attribute was removed
+            changes.append(FieldChange(
+                type="ATTRIBUTE_REMOVED",
+                field=key,
+                from_value=val_a,
+                to_value=None
+            ))
+    
+    for key, val_b in attrs_b.items():
+        if val_b is not None and key not in attrs_a:
+            # Attribute was added
+            changes.append(FieldChange(
+                type="ATTRIBUTE_ADDED",
+                field=key,
+                from_value=None,
+                to_value=val_b
+            ))
     
     return changes
 
 
+def clear_diff_cache() -> None:
+    """Drop all cached diff results (e.g. if a snapshot was ever re-ingested)."""
+    with _diff_cache_lock:
+        _diff_cache.clear()
+
+
 def diff_snapshots(
     snapshot_a_id: UUID,
     snapshot_b_id: UUID,
-    db: DatabaseClient
+    db: DatabaseClient,
+    use_cache: bool = True
 ) -> DiffResult:
     """
     Compare two BOM snapshots and produce a structured diff result.
@@ -282,194 +421,254 @@ def diff_snapshots(
     This approach ensures that items with the same part and attributes
     are recognized as the same item even if they have different bom_item_ids.
     
+    Results are cached by (snapshot_a_id, snapshot_b_id): snapshots are
+    immutable once ingested, so the same pair always diffs the same way. The
+    db client is not part of the key. A result is only cached when both
+    snapshots have items - an unknown id, or a snapshot whose ingest has not
+    committed yet, would otherwise pin an empty diff. Cached results are
+    returned to every caller as the same (immutable) DiffResult.
+    
     Args:
         snapshot_a_id: First snapshot ID (baseline)
         snapshot_b_id: Second snapshot ID (comparison)
         db: Database client
+        use_cache: Reuse (and store) the cached result for this snapshot pair
         
     Returns:
         DiffResult with added, removed, modified items and unchanged count
     """
-    # Step 1: Fetch snapshot items and get all bom_item_ids
-    snapshot_items_a = db.get_snapshot_items(snapshot_a_id)
-    snapshot_items_b = db.get_snapshot_items(snapshot_b_id)
-    
-    all_bom_item_ids = set()
-    for item in snapshot_items_a:
-        all_bom_item_ids.add(UUID(item['bom_item_id']))
-    for item in snapshot_items_b:
-        all_bom_item_ids.add(UUID(item['bom_item_id']))
-    
-    # Step 2: Fetch bom_item_details for all items at once (performance optimization)
-    bom_item_details = {}
-    if all_bom_item_ids:
-        bom_item_details = db.get_bom_item_details(list(all_bom_item_ids))
-    
-    # Step 3: Fetch snapshot states with part information
-    state_a = fetch_snapshot_state(db, snapshot_a_id, bom_item_details)
-    state_b = fetch_snapshot_state(db, snapshot_b_id, bom_item_details)
-    
-    # Step 4: Create semantic keys for all items
+    if not use_cache:
+        return _diff_snapshots_uncached(snapshot_a_id, snapshot_b_id, db)
+    
+    key = (snapshot_a_id, snapshot_b_id)
+    with _diff_cache_lock:
+        result = _diff_cache.get(key)
+        if result is not None:
+            _diff_cache.move_to_end(key)
+            return result
+    
+    # Computed outside the lock; concurrent misses for one pair just both diff
+    result = _diff_snapshots_uncached(snapshot_a_id, snapshot_b_id, db)
+    if not _both_snapshots_have_items(result):
+        return result
+    
+    with _diff_cache_lock:
+        _diff_cache[key] = result
+        if len(_diff_cache) > DIFF_CACHE_SIZE:
+            _diff_cache.popitem(last=False)
+    return result
+
+
+def _both_snapshots_have_items(result: DiffResult) -> bool:
+    """Check that neither side of a diff was an empty (or missing) snapshot."""
+    # Every item of A is removed, modified or unchanged; every item of B is
+    # added, modified or unchanged
+    common = bool(result.modified_items) or result.unchanged_count > 0
+    return (common or bool(result.removed_items)) and (common or bool(result.added_items))
+
+
+def _diff_snapshots_uncached(
+    snapshot_a_id: UUID,
+    snapshot_b_id: UUID,
+    db: DatabaseClient
+) -> DiffResult:
+    """Run the diff pipeline of diff_snapshots() without the result cache."""
+    # Step 1: Classify bom_item_ids by checksum
+    # Full rows are only needed for items that can change the result, so the
+    # cheap (bom_item_id, checksum) comparison runs first - in the database
+    # for clients that support it. Items in both snapshots with equal
+    # checksums are only counted.
+    checksum_delta = db.diff_snapshot_checksums(snapshot_a_id, snapshot_b_id)
+    only_a = set(checksum_delta['removed'])
+    only_b = set(checksum_delta['added'])
+    changed_ids = set(checksum_delta['changed'])
+    unchanged_common_count = checksum_delta['unchanged_count']
+    
+    # Identical snapshots (re-uploads, a snapshot compared with itself) need
+    # no matching at all
+    if not (only_a or only_b or changed_ids):
+        return DiffResult(
+            snapshot_a_id=snapshot_a_id,
+            snapshot_b_id=snapshot_b_id,
+            added_items=(),
+            removed_items=(),
+            modified_items=(),
+            unchanged_count=unchanged_common_count
+        )
+    
+    # Step 2: Fetch part_ids for items without a bom_item_id match
+    # Part identity is only used for semantic matching, and items present in
+    # both snapshots are always matched by bom_item_id first (their states are
+    # built without a part_id).
+    # With unmatched items on one side only (the usual re-upload that keeps
+    # identities), nothing can be matched semantically: those items are
+    # plain removals/additions and need no part_ids or rows at all.
+    if only_a and only_b:
+        unmatched_ids = list(only_a | only_b)
+        hydrate_a = list(changed_ids | only_a)
+        hydrate_b = list(changed_ids | only_b)
+    else:
+        unmatched_ids = []
+        hydrate_a = hydrate_b = list(changed_ids)
+    
+    # Step 3: Build snapshot states with part information
+    # Only changed and unmatched items are hydrated - unchanged items with a
+    # bom_item_id match never reach the field-level diff.
+    
+    # The three lookups are independent round-trips; clients that allow it
+    # run them concurrently
+    lookups = []
+    if unmatched_ids:
+        lookups.append((db.get_bom_item_part_ids, (unmatched_ids,)))
+    if hydrate_a:
+        lookups.append((db.get_snapshot_items_by_ids, (snapshot_a_id, hydrate_a)))
+    if hydrate_b:
+        lookups.append((db.get_snapshot_items_by_ids, (snapshot_b_id, hydrate_b)))
+    
+    if db.supports_concurrent_reads and len(lookups) > 1:
+        with ThreadPoolExecutor(max_workers=len(lookups)) as executor:
+            futures = [executor.submit(method, *args) for method, args in lookups]
+            results = [future.result() for future in futures]
+    else:
+        results = [method(*args) for method, args in lookups]
+    
+    remaining = iter(results)
+    part_ids = next(remaining) if unmatched_ids else {}
+    snapshot_items_a = next(remaining) if hydrate_a else []
+    snapshot_items_b = next(remaining) if hydrate_b else []
+    state_a = fetch_snapshot_state(db, snapshot_a_id, snapshot_items=snapshot_items_a, part_ids=part_ids)
+    state_b = fetch_snapshot_state(db, snapshot_b_id, snapshot_items=snapshot_items_b, part_ids=part_ids)
+    
+    # Step 4: Create semantic keys for items without a bom_item_id match
+    # (items matched by bom_item_id never take part in semantic matching;
+    # both lists are empty when Step 2 skipped the unmatched items)
+    unmatched_a = [(bid, state) for bid, state in state_a.items() if bid in only_a]
+    unmatched_b = [(bid, state) for bid, state in state_b.items() if bid in only_b]
+    
+    # Keys stored at ingest are used only if every item has one: they are not
+    # comparable with keys computed here, so the two kinds are never mixed
+    use_stored_keys = all(
+        state.semantic_key is not None
+        for _, state in (*unmatched_a, *unmatched_b)
+    )
+    
     # Map semantic_key -> list of (bom_item_id, state) tuples
-    semantic_map_a: Dict[str, List[Tuple[UUID, SnapshotItemState]]] = {}
-    semantic_map_b: Dict[str, List[Tuple[UUID, SnapshotItemState]]] = {}
-    
-    # Also create part-based maps for matching items with same part_id but different quantities/attributes
-    part_map_a: Dict[str, List[Tuple[UUID, SnapshotItemState]]] = {}
-    part_map_b: Dict[str, List[Tuple[UUID, SnapshotItemState]]] = {}
-    
-    for bom_item_id, state in state_a.items():
-        semantic_key = _create_semantic_key(state.part_id, state.quantity, state.attributes)
-        if semantic_key not in semantic_map_a:
-            semantic_map_a[semantic_key] = []
-        semantic_map_a[semantic_key].append((bom_item_id, state))
-        
-        # Also index by part_id for part-based matching
-        part_key = _create_part_based_key(state.part_id)
-        if part_key not in part_map_a:
-            part_map_a[part_key] = []
-        part_map_a[part_key].append((bom_item_id, state))
-    
-    for bom_item_id, state in state_b.items():
-        semantic_key = _create_semantic_key(state.part_id, state.quantity, state.attributes)
-        if semantic_key not in semantic_map_b:
-            semantic_map_b[semantic_key] = []
-        semantic_map_b[semantic_key].append((bom_item_id, state))
-        
-        # Also index by part_id for part-based matching
-        part_key = _create_part_based_key(state.part_id)
-        if part_key not in part_map_b:
-            part_map_b[part_key] = []
-        part_map_b[part_key].append((bom_item_id, state))
+    semantic_map_a: Dict[Any, List[Tuple[UUID, SnapshotItemState]]] = defaultdict(list)
+    semantic_map_b: Dict[Any, List[Tuple[UUID, SnapshotItemState]]] = defaultdict(list)
+    
+    for unmatched, semantic_map in ((unmatched_a, semantic_map_a), (unmatched_b, semantic_map_b)):
+        for bom_item_id, state in unmatched:
+            if use_stored_keys:
+                semantic_key = state.semantic_key
+            else:
+                semantic_key = _create_semantic_key(state.part_id, state.quantity, _semantic_attributes(state))
+            semantic_map[semantic_key].append((bom_item_id, state))
     
     # Step 5: Match items by semantic key
-    # Track which items have been matched
-    matched_a = set()
+    # Track which unmatched items have been paired up (items present in both
+    # snapshots are always matched and never need to be tracked)
+    # matched_pairs maps bom_item_id_a -> bom_item_id_b, so its keys are the
+    # matched A items; matched_b holds the matched B items
+    matched_pairs: Dict[UUID, UUID] = {}
     matched_b = set()
-    matched_pairs: List[Tuple[UUID, UUID]] = []  # (bom_item_id_a, bom_item_id_b)
-    
-    # First, try exact bom_item_id matches (fast path)
-    # Items with same bom_item_id are matched regardless of checksum
-    # (they'll be classified as modified or unchanged later based on checksum)
-    common_bom_item_ids = set(state_a.keys()) & set(state_b.keys())
-    for bom_item_id in common_bom_item_ids:
-        matched_a.add(bom_item_id)
-        matched_b.add(bom_item_id)
-        matched_pairs.append((bom_item_id, bom_item_id))
-    
-    # Then, match by semantic key for unmatched items (exact matches: part_id + quantity + attributes)
+    
+    # Items with same bom_item_id are matched regardless of checksum: the
+    # unchanged ones were already counted in Step 1 and the changed ones
+    # (changed_ids) go straight to the field diff in Step 7
+    
+    # Match by semantic key for unmatched items (exact matches: part_id + quantity + attributes)
     # Items with same semantic key should be matched even if they have different bom_item_ids
-    for semantic_key in set(semantic_map_a.keys()) | set(semantic_map_b.keys()):
-        items_a = semantic_map_a.get(semantic_key, [])
-        items_b = semantic_map_b.get(semantic_key, [])
+    # (only keys present on both sides can produce a match)
+    for semantic_key in semantic_map_a.keys() & semantic_map_b.keys():
+        items_a = semantic_map_a[semantic_key]
+        items_b = semantic_map_b[semantic_key]
         
-        # Filter out already matched items
-        items_a_unmatched = [(bid, s) for bid, s in items_a if bid not in matched_a]
-        items_b_unmatched = [(bid, s) for bid, s in items_b if bid not in matched_b]
-        
-        # Match items with same semantic key
         # Match all items with same semantic key, preferring checksum matches
         # but still matching even if checksums differ (they'll be marked as modified)
-        while items_a_unmatched and items_b_unmatched:
-            # Find best match: prefer exact checksum match, then any match
-            best_match_idx_a = None
-            best_match_idx_b = None
-            best_is_exact = False
-            
-            for idx_a, (bid_a, state_a_item) in enumerate(items_a_unmatched):
-                for idx_b, (bid_b, state_b_item) in enumerate(items_b_unmatched):
-                    is_exact = state_a_item.checksum == state_b_item.checksum
-                    
-                    # Prefer exact checksum match
-                    if is_exact and not best_is_exact:
-                        best_match_idx_a = idx_a
-                        best_match_idx_b = idx_b
-                        best_is_exact = True
-                    elif best_match_idx_a is None:
-                        # Keep first potential match as fallback
-                        best_match_idx_a = idx_a
-                        best_match_idx_b = idx_b
-                        best_is_exact = False
-            
-            if best_match_idx_a is not None and best_match_idx_b is not None:
-                bom_item_id_a, state_a_item = items_a_unmatched[best_match_idx_a]
-                bom_item_id_b, state_b_item = items_b_unmatched[best_match_idx_b]
-                
-                matched_a.add(bom_item_id_a)
+        
+        # Exact checksum matches first: each A item (in order) takes the
+        # earliest unmatched B item with the same checksum
+        b_by_checksum: Dict[str, Deque[UUID]] = defaultdict(deque)
+        for bom_item_id_b, state_b_item in items_b:
+            b_by_checksum[state_b_item.checksum].append(bom_item_id_b)
+        
+        leftover_a = []
+        for bom_item_id_a, state_a_item in items_a:
+            candidates = b_by_checksum.get(state_a_item.checksum)
+            if candidates:
+                bom_item_id_b = candidates.popleft()
+                matched_pairs[bom_item_id_a] = bom_item_id_b
                 matched_b.add(bom_item_id_b)
-                matched_pairs.append((bom_item_id_a, bom_item_id_b))
-                
-                # Remove matched items from lists
-                items_a_unmatched.pop(best_match_idx_a)
-                # Adjust index if we removed an item before the second one
-                if best_match_idx_b > best_match_idx_a:
-                    best_match_idx_b -= 1
-                items_b_unmatched.pop(best_match_idx_b)
             else:
-                # No more matches possible
-                break
+                leftover_a.append(bom_item_id_a)
+        
+        # Then pair whatever is left on both sides in order
+        leftover_b = [bid for bid, _ in items_b if bid not in matched_b]
+        for bom_item_id_a, bom_item_id_b in zip(leftover_a, leftover_b):
+            matched_pairs[bom_item_id_a] = bom_item_id_b
+            matched_b.add(bom_item_id_b)
     
     # Finally, match by part_id only for remaining unmatched items
     # Items with same part_id but different quantities/attributes should be matched as modified
     # This handles cases where quantity or attributes changed but it's the same part
-    for part_key in set(part_map_a.keys()) | set(part_map_b.keys()):
-        items_a = part_map_a.get(part_key, [])
-        items_b = part_map_b.get(part_key, [])
-        
-        # Filter out already matched items
-        items_a_unmatched = [(bid, s) for bid, s in items_a if bid not in matched_a]
-        items_b_unmatched = [(bid, s) for bid, s in items_b if bid not in matched_b]
-        
+    # Part maps are built from what is still unmatched after the semantic pass
+    part_map_a: Dict[Optional[UUID], List[UUID]] = defaultdict(list)
+    part_map_b: Dict[Optional[UUID], List[UUID]] = defaultdict(list)
+    
+    for bom_item_id, state in unmatched_a:
+        if bom_item_id not in matched_pairs:
+            part_map_a[_create_part_based_key(state.part_id)].append(bom_item_id)
+    
+    for bom_item_id, state in unmatched_b:
+        if bom_item_id not in matched_b:
+            part_map_b[_create_part_based_key(state.part_id)].append(bom_item_id)
+    
+    for part_key in part_map_a.keys() & part_map_b.keys():
         # Match items with same part_id (even if quantity/attributes differ)
         # This ensures items with same part are marked as modified, not removed+added
-        while items_a_unmatched and items_b_unmatched:
-            # Match first available pair (they'll be marked as modified if checksums differ)
-            bom_item_id_a, state_a_item = items_a_unmatched[0]
-            bom_item_id_b, state_b_item = items_b_unmatched[0]
-            
-            matched_a.add(bom_item_id_a)
+        # Pairs are taken in order (they'll be marked as modified if checksums differ)
+        for bom_item_id_a, bom_item_id_b in zip(part_map_a[part_key], part_map_b[part_key]):
+            matched_pairs[bom_item_id_a] = bom_item_id_b
             matched_b.add(bom_item_id_b)
-            matched_pairs.append((bom_item_id_a, bom_item_id_b))
-            
-            # Remove matched items
-            items_a_unmatched.pop(0)
-            items_b_unmatched.pop(0)
     
     # Step 6: Classify items
     # Only items that couldn't be matched at all are truly added/removed
-    added_ids = set(state_b.keys()) - matched_b
-    removed_ids = set(state_a.keys()) - matched_a
+    added_ids = only_b - matched_b
+    removed_ids = only_a - matched_pairs.keys()
+    
+    # Step 7: Find modified items and count unchanged ones
+    # bom_item_id matches in changed_ids are known to differ; semantic matches
+    # are split by checksum first, so only the changed subset is diffed
+    # (runs in-process: diff_snapshot_item is pure-Python dict work that holds
+    # the GIL, so a thread pool would only add scheduling overhead)
+    changed_pairs = [(bom_item_id, bom_item_id) for bom_item_id in changed_ids]
+    unchanged_count = unchanged_common_count
+    for bom_item_id_a, bom_item_id_b in matched_pairs.items():
+        if state_a[bom_item_id_a].checksum == state_b[bom_item_id_b].checksum:
+            unchanged_count += 1
+        else:
+            changed_pairs.append((bom_item_id_a, bom_item_id_b))
     
-    # Step 7: Find modified items (matched but checksum differs)
-    # This includes both bom_item_id matches and semantic matches
     modified_items = []
-    for bom_item_id_a, bom_item_id_b in matched_pairs:
-        state_a_item = state_a[bom_item_id_a]
-        state_b_item = state_b[bom_item_id_b]
-        
-        if state_a_item.checksum != state_b_item.checksum:
-            changes = diff_snapshot_item(state_a_item, state_b_item)
-            if changes:
-                # Use bom_item_id from snapshot B (the newer one)
-                modified_items.append(ModifiedItem(
-                    bom_item_id=bom_item_id_b,
-                    changes=changes
-                ))
-    
-    # Step 8: Calculate unchanged count
-    # Only items with matching checksums are truly unchanged
-    unchanged_count = sum(
-        1 for bom_item_id_a, bom_item_id_b in matched_pairs
-        if state_a[bom_item_id_a].checksum == state_b[bom_item_id_b].checksum
-    )
+    append_modified = modified_items.append
+    for bom_item_id_a, bom_item_id_b in changed_pairs:
+        changes = diff_snapshot_item(state_a[bom_item_id_a], state_b[bom_item_id_b])
+        if changes:
+            # Use bom_item_id from snapshot B (the newer one)
+            append_modified(ModifiedItem(
+                bom_item_id=bom_item_id_b,
+                changes=tuple(changes)
+            ))
     
     # Return structured result
     return DiffResult(
         snapshot_a_id=snapshot_a_id,
         snapshot_b_id=snapshot_b_id,
-        added_items=sorted(list(added_ids)),
-        removed_items=sorted(list(removed_ids)),
-        modified_items=modified_items,
+        # Sort on UUID.int: same order as UUID comparison, without
+        # calling UUID.__lt__ per comparison
+        added_items=tuple(sorted(added_ids, key=_uuid_int)),
+        removed_items=tuple(sorted(removed_ids, key=_uuid_int)),
+        modified_items=tuple(modified_items),
         unchanged_count=unchanged_count
     )
 
@@ -4,7 +4,8 @@ from .snapshot_ingest import (
     ingest_bom_snapshot,
     NormalizedRow,
     DatabaseClient,
-    normalize_row_from_dict
+    normalize_row_from_dict,
+    normalize_rows_from_dicts
 )
 from .supabase_client import SupabaseClient
 
@@ -18,6 +19,7 @@ __all__ = [
     "DatabaseClient",
     "SupabaseClient",
     "normalize_row_from_dict",
+    "normalize_rows_from_dicts",
 ]
 
 
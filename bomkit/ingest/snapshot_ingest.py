@@ -16,10 +16,13 @@ Key principles:
 import hashlib
 import json
 import logging
+import re
 from dataclasses import dataclass
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, Iterable, List, Tuple, Union
 from uuid import UUID
 
+from .._compat import DATACLASS_SLOTS
+
 # Configure logging for identity resolution decisions
 logger = logging.getLogger(__name__)
 
@@ -35,7 +38,7 @@ logger = logging.getLogger(__name__)
 # - Excluded from checksum computation
 # - Excluded from semantic diffing
 # - Never shown to engineers
-NON_SEMANTIC_ATTRIBUTE_KEYS = {
+NON_SEMANTIC_ATTRIBUTE_KEYS = frozenset({
     "row_index",           # CSV row position (not semantic)
     "source_row",          # Original row data (not semantic)
     "raw_row",             # Raw CSV row (not semantic)
@@ -44,10 +47,41 @@ NON_SEMANTIC_ATTRIBUTE_KEYS = {
     "csv_row_number",      # Row number in CSV (not semantic)
     "import_timestamp",    # When imported (not semantic)
     "source_file",         # Source file name (not semantic)
-}
+})
+
+# Intrinsic part specs copied from row.attributes into parts.attributes
+# (in this order; see _extract_part_attributes)
+_PART_ATTRIBUTE_KEYS = (
+    "value",                     # Electrical value, rating, etc.
+    "tolerance",
+    "material",
+    "package",                   # Footprint, case type
+    "manufacturer",              # Manufacturer info is intrinsic to the part
+    "manufacturer_part_number",
+    "description",               # Part-level description
+    "unit",                      # If applicable to the part itself
+)
+
+# Stable usage context copied from row.context into bom_items.context
+# (reference_designator is deliberately absent; see _extract_bom_item_context)
+_BOM_ITEM_CONTEXT_KEYS = ("notes", "placement", "torque", "install_notes")
 
+# Normalizer columns copied into NormalizedRow.attributes when non-empty
+# (in this order; see normalize_row_from_dict)
+_ROW_ATTRIBUTE_COLUMNS = (
+    "value",
+    "package",
+    "manufacturer",
+    "manufacturer_part_number",
+    "description",
+    "unit",
+)
 
-@dataclass
+# Tolerance mentioned in free-text notes (e.g., "Tolerance: 5%")
+_TOLERANCE_RE = re.compile(r'tolerance[:\s]+([0-9.]+%)', re.IGNORECASE)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class NormalizedRow:
     """
     Represents a normalized BOM row from bomkit.
@@ -108,25 +142,16 @@ def normalize_row_from_dict(
     # Extract part attributes (intrinsic specs)
     # These go into parts.attributes
     attributes = {}
-    if row_dict.get("value"):
-        attributes["value"] = row_dict["value"]
-    if row_dict.get("package"):
-        attributes["package"] = row_dict["package"]
-    if row_dict.get("manufacturer"):
-        attributes["manufacturer"] = row_dict["manufacturer"]
-    if row_dict.get("manufacturer_part_number"):
-        attributes["manufacturer_part_number"] = row_dict["manufacturer_part_number"]
-    if row_dict.get("description"):
-        attributes["description"] = row_dict["description"]
-    if row_dict.get("unit"):
-        attributes["unit"] = row_dict["unit"]
+    for key in _ROW_ATTRIBUTE_COLUMNS:
+        value = row_dict.get(key)
+        if value:
+            attributes[key] = value
     
     # Extract tolerance from notes if present (common pattern)
     notes = row_dict.get("notes", "")
     if notes:
         # Try to extract tolerance (e.g., "Tolerance: 5%")
-        import re
-        tolerance_match = re.search(r'tolerance[:\s]+([0-9.]+%)', notes, re.IGNORECASE)
+        tolerance_match = _TOLERANCE_RE.search(notes)
         if tolerance_match:
             attributes["tolerance"] = tolerance_match.group(1)
     
@@ -147,6 +172,30 @@ def normalize_row_from_dict(
     )
 
 
+def normalize_rows_from_dicts(
+    row_dicts: Iterable[Dict[str, Any]],
+    start_index: int = 0
+) -> List[NormalizedRow]:
+    """
+    Convert a batch of normalized dictionaries to NormalizedRow objects.
+    
+    Equivalent to calling normalize_row_from_dict for each row with
+    consecutive row indexes, without the per-row call overhead.
+    
+    Args:
+        row_dicts: Dictionaries with standard column names from BomNormalizer
+        start_index: Row index assigned to the first dictionary
+        
+    Returns:
+        List of NormalizedRow instances, in input order
+    """
+    normalize = normalize_row_from_dict
+    return [
+        normalize(row_dict, row_index)
+        for row_index, row_dict in enumerate(row_dicts, start_index)
+    ]
+
+
 class DatabaseClient:
     """
     Abstract database client interface.
@@ -155,6 +204,10 @@ class DatabaseClient:
     All methods should use transactions and be idempotent where possible.
     """
     
+    # Set to True when read methods may be called from several threads at
+    # once (e.g. each call checks out its own pooled connection)
+    supports_concurrent_reads: bool = False
+    
     def get_or_create_organization(
         self,
         org_id: UUID,
@@ -316,7 +369,9 @@ class DatabaseClient:
         bom_item_id: UUID,
         quantity: Optional[int],
         attributes: Dict[str, Any],
-        checksum: str
+        checksum: str,
+        attributes_checksum: Optional[str] = None,
+        semantic_key: Optional[str] = None
     ) -> None:
         """
         Insert a snapshot_item (materialized state at snapshot time).
@@ -327,9 +382,35 @@ class DatabaseClient:
             quantity: Quantity at this snapshot
             attributes: Snapshot-local attributes (temporary notes, row_index, etc.)
             checksum: Deterministic checksum of quantity + attributes
+            attributes_checksum: Optional checksum of the semantic attributes alone
+                (lets the diff skip attribute comparison for quantity-only changes)
+            semantic_key: Optional precomputed semantic matching key
+                (lets the diff skip computing it per item)
         """
         raise NotImplementedError
     
+    def insert_snapshot_items_bulk(
+        self,
+        snapshot_id: UUID,
+        items: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Insert many snapshot_items at once.
+        
+        Items are applied in order, so when a bom_item_id repeats the last item
+        wins (as with repeated insert_snapshot_item() calls). The default
+        implementation calls insert_snapshot_item() per item; clients should
+        override it with a batched insert.
+        
+        Args:
+            snapshot_id: Snapshot ID
+            items: Dictionaries with the insert_snapshot_item() arguments
+                (bom_item_id, quantity, attributes, checksum and optionally
+                attributes_checksum, semantic_key)
+        """
+        for item in items:
+            self.insert_snapshot_item(snapshot_id=snapshot_id, **item)
+    
     def begin_transaction(self) -> None:
         """Begin a database transaction."""
         raise NotImplementedError
@@ -359,6 +440,122 @@ class DatabaseClient:
         """
         raise NotImplementedError
     
+    def get_snapshot_checksums(
+        self,
+        snapshot_id: UUID
+    ) -> Dict[UUID, str]:
+        """
+        Get the checksum of every item in a snapshot.
+        
+        Used by the diff engine to find changed items before loading full rows.
+        The default implementation reads them from get_snapshot_items(); clients
+        should override it with a query that skips quantity and attributes.
+        
+        Args:
+            snapshot_id: Snapshot ID
+            
+        Returns:
+            Dictionary mapping bom_item_id -> checksum
+        """
+        return {
+            UUID(str(item['bom_item_id'])): item['checksum']
+            for item in self.get_snapshot_items(snapshot_id)
+        }
+    
+    def get_snapshot_checksums_multi(
+        self,
+        snapshot_ids: List[UUID]
+    ) -> Dict[UUID, Dict[UUID, str]]:
+        """
+        Get the item checksums of several snapshots at once.
+        
+        The default implementation calls get_snapshot_checksums() per snapshot;
+        clients should override it to fetch all snapshots in one round-trip.
+        
+        Args:
+            snapshot_ids: List of snapshot IDs
+            
+        Returns:
+            Dictionary mapping snapshot_id -> {bom_item_id -> checksum}
+            (every requested snapshot is present, possibly empty)
+        """
+        return {
+            snapshot_id: self.get_snapshot_checksums(snapshot_id)
+            for snapshot_id in snapshot_ids
+        }
+    
+    def diff_snapshot_checksums(
+        self,
+        snapshot_a_id: UUID,
+        snapshot_b_id: UUID
+    ) -> Dict[str, Any]:
+        """
+        Classify the bom_items of two snapshots by checksum.
+        
+        The default implementation compares the get_snapshot_checksums_multi()
+        maps in Python; clients should override it to do the comparison in the
+        database and only return the rows that differ.
+        
+        Args:
+            snapshot_a_id: First snapshot ID (baseline)
+            snapshot_b_id: Second snapshot ID (comparison)
+            
+        Returns:
+            Dictionary with:
+            - removed: bom_item_ids only in snapshot A
+            - added: bom_item_ids only in snapshot B
+            - changed: bom_item_ids in both snapshots with different checksums
+            - unchanged_count: number of bom_item_ids in both with equal checksums
+        """
+        checksums = self.get_snapshot_checksums_multi([snapshot_a_id, snapshot_b_id])
+        checksums_a = checksums[snapshot_a_id]
+        checksums_b = checksums[snapshot_b_id]
+        
+        ids_a = checksums_a.keys()
+        ids_b = checksums_b.keys()
+        # (bom_item_id, checksum) pairs only in A are either removed or changed
+        changed = [
+            bom_item_id for bom_item_id, _ in checksums_a.items() - checksums_b.items()
+            if bom_item_id in checksums_b
+        ]
+        common_count = len(ids_a & ids_b)
+        
+        return {
+            'removed': list(ids_a - ids_b),
+            'added': list(ids_b - ids_a),
+            'changed': changed,
+            'unchanged_count': common_count - len(changed)
+        }
+    
+    def get_snapshot_items_by_ids(
+        self,
+        snapshot_id: UUID,
+        bom_item_ids: List[UUID]
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the snapshot items for a subset of bom_items.
+        
+        Same rows as get_snapshot_items(), restricted to bom_item_ids. The
+        default implementation filters the full snapshot; clients should
+        override it with a narrower query.
+        
+        Args:
+            snapshot_id: Snapshot ID
+            bom_item_ids: List of bom_item UUIDs
+            
+        Returns:
+            List of dictionaries with bom_item_id, quantity, attributes, checksum
+            and, if stored, attributes_checksum and semantic_key
+            (bom_item_id may be a UUID or its string form)
+        """
+        if not bom_item_ids:
+            return []
+        wanted = set(bom_item_ids)
+        return [
+            item for item in self.get_snapshot_items(snapshot_id)
+            if UUID(str(item['bom_item_id'])) in wanted
+        ]
+    
     def get_bom_item_details(
         self,
         bom_item_ids: List[UUID]
@@ -382,6 +579,31 @@ class DatabaseClient:
         """
         raise NotImplementedError
     
+    def get_bom_item_part_ids(
+        self,
+        bom_item_ids: List[UUID]
+    ) -> Dict[UUID, Optional[UUID]]:
+        """
+        Get the part_id of each bom_item.
+        
+        Used by the diff engine, which only needs part identity for semantic
+        matching. The default implementation reads it from
+        get_bom_item_details(); clients should override it with a narrower query.
+        
+        Args:
+            bom_item_ids: List of bom_item UUIDs
+            
+        Returns:
+            Dictionary mapping bom_item_id -> part_id (missing items are omitted)
+        """
+        if not bom_item_ids:
+            return {}
+        details = self.get_bom_item_details(bom_item_ids)
+        return {
+            bom_item_id: item.get('part_id')
+            for bom_item_id, item in details.items()
+        }
+    
     def get_snapshot_info(
         self,
         snapshot_id: UUID
@@ -420,14 +642,24 @@ def _filter_semantic_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
         attributes: Raw attributes dictionary
         
     Returns:
-        Filtered dictionary with only semantic attributes
+        Filtered dictionary with only semantic attributes (the input itself
+        when it has no non-semantic keys - treat it as read-only)
     """
+    if NON_SEMANTIC_ATTRIBUTE_KEYS.isdisjoint(attributes):
+        return attributes
     return {
         k: v for k, v in attributes.items()
         if k not in NON_SEMANTIC_ATTRIBUTE_KEYS
     }
 
 
+# Shared encoder for checksums and semantic keys. Same output as
+# json.dumps(..., sort_keys=True, default=str), which would build a new
+# JSONEncoder on every call. The bytes must not change: stored checksums are
+# compared across snapshots ingested at different times.
+_CANONICAL_JSON_ENCODER = json.JSONEncoder(sort_keys=True, default=str)
+
+
 def _canonicalize_for_checksum(value: Any) -> Any:
     """
     Canonicalize a value for checksum computation.
@@ -492,10 +724,106 @@ def _compute_checksum(quantity: Optional[int], attributes: Dict[str, Any]) -> st
         "quantity": quantity,
         "attributes": canonical_attrs
     }
-    json_str = json.dumps(payload, sort_keys=True, default=str)
+    json_str = _CANONICAL_JSON_ENCODER.encode(payload)
     return hashlib.sha256(json_str.encode('utf-8')).hexdigest()
 
 
+def _compute_attributes_checksum(attributes: Dict[str, Any]) -> str:
+    """
+    Compute a checksum of the semantic attributes alone.
+    
+    Stored next to the full checksum so the diff can tell quantity-only
+    changes apart without comparing attributes. Unlike _compute_checksum(),
+    values are NOT canonicalized: equal checksums must mean the semantic
+    attributes compare equal, or the diff would hide whitespace-only edits.
+    
+    Args:
+        attributes: Snapshot-local attributes (may contain non-semantic keys)
+        
+    Returns:
+        SHA256 hex digest
+    """
+    semantic_attrs = _filter_semantic_attributes(attributes)
+    json_str = _CANONICAL_JSON_ENCODER.encode(semantic_attrs)
+    return hashlib.sha256(json_str.encode('utf-8')).hexdigest()
+
+
+def _compute_semantic_key(
+    part_id: Optional[UUID],
+    quantity: Optional[Union[int, float]],
+    attributes: Dict[str, Any]
+) -> str:
+    """
+    Compute the semantic matching key of a snapshot_item at ingest time.
+    
+    Identifies the same logical item (part + quantity + semantic attributes)
+    across snapshots even when it has a different bom_item_id. Stored with the
+    snapshot_item so the diff does not rebuild it for every comparison.
+    
+    Quantity is normalized to float, the type the diff reads it back as from
+    the numeric column, so 2 and 2.0 produce the same key.
+    
+    Args:
+        part_id: Part ID of the bom_item (None if not available)
+        quantity: Quantity value
+        attributes: Snapshot-local attributes (may contain non-semantic keys)
+        
+    Returns:
+        MD5 hex digest (32 chars)
+    """
+    semantic_attrs = _filter_semantic_attributes(attributes)
+    key_str = "|".join((
+        str(part_id) if part_id else "NO_PART",
+        str(float(quantity)) if quantity is not None else "NO_QTY",
+        _CANONICAL_JSON_ENCODER.encode(semantic_attrs)
+    ))
+    return hashlib.md5(key_str.encode('utf-8')).hexdigest()
+
+
+def _compute_checksums_batch(
+    items: Iterable[Tuple[Optional[UUID], Optional[int], Dict[str, Any]]]
+) -> List[Tuple[str, str, str]]:
+    """
+    Compute the stored digests for a batch of snapshot_items.
+    
+    Same output as calling _compute_checksum(), _compute_attributes_checksum()
+    and _compute_semantic_key() per item, but filters each item's attributes
+    once and serializes the semantic attributes once for the last two.
+    
+    Args:
+        items: (part_id, quantity, attributes) per snapshot_item
+        
+    Returns:
+        (checksum, attributes_checksum, semantic_key) per item, in input order
+    """
+    encode = _CANONICAL_JSON_ENCODER.encode
+    sha256 = hashlib.sha256
+    md5 = hashlib.md5
+    digests = []
+    for part_id, quantity, attributes in items:
+        semantic_attrs = _filter_semantic_attributes(attributes)
+        payload = {
+            "quantity": quantity,
+            "attributes": {
+                k: _canonicalize_for_checksum(v)
+                for k, v in semantic_attrs.items()
+            }
+        }
+        checksum = sha256(encode(payload).encode('utf-8')).hexdigest()
+        
+        attrs_json = encode(semantic_attrs)
+        attributes_checksum = sha256(attrs_json.encode('utf-8')).hexdigest()
+        key_str = "|".join((
+            str(part_id) if part_id else "NO_PART",
+            str(float(quantity)) if quantity is not None else "NO_QTY",
+            attrs_json
+        ))
+        semantic_key = md5(key_str.encode('utf-8')).hexdigest()
+        
+        digests.append((checksum, attributes_checksum, semantic_key))
+    return digests
+
+
 def _extract_part_attributes(row: NormalizedRow) -> Dict[str, Any]:
     """
     Extract intrinsic part attributes from a normalized row.
@@ -513,38 +841,13 @@ def _extract_part_attributes(row: NormalizedRow) -> Dict[str, Any]:
     """
     # Map from normalized row fields to part attributes
     # These are the intrinsic specs that define the part identity
+    # (one get() per key; empty values are skipped)
+    get = row.attributes.get
     attributes = {}
-    
-    # Value (electrical value, rating, etc.)
-    if row.attributes.get("value"):
-        attributes["value"] = row.attributes["value"]
-    
-    # Tolerance
-    if row.attributes.get("tolerance"):
-        attributes["tolerance"] = row.attributes["tolerance"]
-    
-    # Material
-    if row.attributes.get("material"):
-        attributes["material"] = row.attributes["material"]
-    
-    # Package (footprint, case type)
-    if row.attributes.get("package"):
-        attributes["package"] = row.attributes["package"]
-    
-    # Manufacturer info (intrinsic to the part)
-    if row.attributes.get("manufacturer"):
-        attributes["manufacturer"] = row.attributes["manufacturer"]
-    
-    if row.attributes.get("manufacturer_part_number"):
-        attributes["manufacturer_part_number"] = row.attributes["manufacturer_part_number"]
-    
-    # Description (if it's a part-level description)
-    if row.attributes.get("description"):
-        attributes["description"] = row.attributes["description"]
-    
-    # Unit (if applicable to the part itself)
-    if row.attributes.get("unit"):
-        attributes["unit"] = row.attributes["unit"]
+    for key in _PART_ATTRIBUTE_KEYS:
+        value = get(key)
+        if value:
+            attributes[key] = value
     
     return attributes
 
@@ -588,17 +891,11 @@ def _extract_bom_item_context(row: NormalizedRow) -> Dict[str, Any]:
     
     # Usage-specific notes (placement, installation, etc.)
     # These are stable usage context that defines HOW the part is used
-    if row.context.get("notes"):
-        context["notes"] = row.context["notes"]
-    
-    if row.context.get("placement"):
-        context["placement"] = row.context["placement"]
-    
-    if row.context.get("torque"):
-        context["torque"] = row.context["torque"]
-    
-    if row.context.get("install_notes"):
-        context["install_notes"] = row.context["install_notes"]
+    get = row.context.get
+    for key in _BOM_ITEM_CONTEXT_KEYS:
+        value = get(key)
+        if value:
+            context[key] = value
     
     return context
 
@@ -631,8 +928,9 @@ def _extract_snapshot_attributes(row: NormalizedRow) -> Dict[str, Any]:
     # - Refdes changes show as MODIFY, not remove+add
     # - Same bom_item_id is reused across snapshots
     # - Identity remains stable even when refdes changes
-    if row.context.get("reference_designator"):
-        attributes["reference_designator"] = row.context["reference_designator"]
+    reference_designator = row.context.get("reference_designator")
+    if reference_designator:
+        attributes["reference_designator"] = reference_designator
     
     # Row index for debugging/traceability
     # NOTE: This is NON-SEMANTIC and will be filtered from checksums/diffs
@@ -646,11 +944,53 @@ def _extract_snapshot_attributes(row: NormalizedRow) -> Dict[str, Any]:
     return attributes
 
 
+def _split_row(row: NormalizedRow) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """
+    Split a normalized row into the three places its data goes.
+    
+    Done once per row during ingest so the resolvers and the snapshot_item
+    insert share the extracted dicts instead of each extracting their own.
+    
+    Returns:
+        (part attributes, bom_item context, snapshot-local attributes)
+    """
+    return (
+        _extract_part_attributes(row),
+        _extract_bom_item_context(row),
+        _extract_snapshot_attributes(row)
+    )
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Convert a JSON-like value into a hashable equivalent for memo keys.
+    
+    Values that compare equal freeze to equal keys (dicts become frozensets of
+    items, lists become tuples). Raises TypeError for other unhashable values.
+    """
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    hash(value)
+    return value
+
+
+def _resolution_cache_key(*parts: Any) -> Optional[Tuple[Any, ...]]:
+    """Build a memo key from the identity-resolution inputs (None if unhashable)."""
+    try:
+        return tuple(_freeze(part) for part in parts)
+    except TypeError:
+        return None
+
+
 def _resolve_or_create_part(
     db: DatabaseClient,
     org_id: UUID,
     row: NormalizedRow,
-    debug: bool = False
+    debug: bool = False,
+    part_cache: Optional[Dict[Tuple[Any, ...], UUID]] = None,
+    part_attributes: Optional[Dict[str, Any]] = None
 ) -> UUID:
     """
     Resolve an existing part or create a new one.
@@ -667,11 +1007,22 @@ def _resolve_or_create_part(
         org_id: Organization ID
         row: Normalized row
         debug: Enable debug logging
+        part_cache: Optional memo of (part_name, attributes) -> part_id for
+            this ingest; rows identical to an already resolved one reuse its
+            part without another similarity lookup
+        part_attributes: Optional pre-extracted part attributes (see _split_row)
         
     Returns:
         Part UUID (existing or newly created)
     """
-    part_attributes = _extract_part_attributes(row)
+    if part_attributes is None:
+        part_attributes = _extract_part_attributes(row)
+    
+    cache_key = None
+    if part_cache is not None:
+        cache_key = _resolution_cache_key(row.part_name, part_attributes)
+        if cache_key is not None and cache_key in part_cache:
+            return part_cache[cache_key]
     
     # Find similar parts
     similar_parts = db.find_similar_parts(
@@ -691,6 +1042,8 @@ def _resolve_or_create_part(
                 f"(confidence: {confidence:.2f})"
             )
         
+        if cache_key is not None:
+            part_cache[cache_key] = best_match_id
         return best_match_id
     
     # No good match found, create new part
@@ -703,6 +1056,8 @@ def _resolve_or_create_part(
     if debug:
         logger.info(f"Part created: '{row.part_name}' → new part {part_id}")
     
+    if cache_key is not None:
+        part_cache[cache_key] = part_id
     return part_id
 
 
@@ -711,7 +1066,9 @@ def _resolve_or_create_bom_item(
     assembly_id: UUID,
     part_id: UUID,
     row: NormalizedRow,
-    debug: bool = False
+    debug: bool = False,
+    bom_item_cache: Optional[Dict[Tuple[Any, ...], UUID]] = None,
+    context: Optional[Dict[str, Any]] = None
 ) -> UUID:
     """
     Resolve an existing bom_item or create a new one.
@@ -740,11 +1097,22 @@ def _resolve_or_create_bom_item(
         part_id: Part ID
         row: Normalized row
         debug: Enable debug logging
+        bom_item_cache: Optional memo of (part_id, context) -> bom_item_id for
+            this ingest (one assembly); rows identical to an already resolved
+            one reuse its bom_item without another similarity lookup
+        context: Optional pre-extracted usage context (see _split_row)
         
     Returns:
         BOM item UUID (existing or newly created)
     """
-    context = _extract_bom_item_context(row)
+    if context is None:
+        context = _extract_bom_item_context(row)
+    
+    cache_key = None
+    if bom_item_cache is not None:
+        cache_key = _resolution_cache_key(part_id, context)
+        if cache_key is not None and cache_key in bom_item_cache:
+            return bom_item_cache[cache_key]
     
     # Find similar bom_items
     # NOTE: Context does NOT include row_index or reference_designator.
@@ -767,6 +1135,8 @@ def _resolve_or_create_bom_item(
                 f"→ existing bom_item {best_match_id} (confidence: {confidence:.2f})"
             )
         
+        if cache_key is not None:
+            bom_item_cache[cache_key] = best_match_id
         return best_match_id
     
     # No good match found, create new bom_item
@@ -782,6 +1152,8 @@ def _resolve_or_create_bom_item(
             f"→ new bom_item {bom_item_id}"
         )
     
+    if cache_key is not None:
+        bom_item_cache[cache_key] = bom_item_id
     return bom_item_id
 
 
@@ -912,9 +1284,16 @@ def ingest_bom_snapshot(
         # We need to resolve parts and bom_items before creating the snapshot
         # because snapshot_items reference bom_item_id
         
-        bom_item_mappings = []  # List of (bom_item_id, row) tuples
+        bom_item_mappings = []  # List of (bom_item_id, part_id, row, snapshot_attributes) tuples
+        
+        # Repeated rows (e.g. 100 identical 0.1uF caps) resolve to the same
+        # part/bom_item, so each distinct row is only looked up once
+        part_cache: Dict[Tuple[Any, ...], UUID] = {}
+        bom_item_cache: Dict[Tuple[Any, ...], UUID] = {}
         
         for row in rows:
+            part_attributes, context, snapshot_attributes = _split_row(row)
+            
             # --------------------------------------------------------------------
             # STEP 2a: Resolve or Create Part (DESIGN INTENT)
             # --------------------------------------------------------------------
@@ -925,7 +1304,9 @@ def ingest_bom_snapshot(
                 db=db,
                 org_id=org_id,
                 row=row,
-                debug=debug
+                debug=debug,
+                part_cache=part_cache,
+                part_attributes=part_attributes
             )
             
             # --------------------------------------------------------------------
@@ -939,10 +1320,12 @@ def ingest_bom_snapshot(
                 assembly_id=assembly_id,
                 part_id=part_id,
                 row=row,
-                debug=debug
+                debug=debug,
+                bom_item_cache=bom_item_cache,
+                context=context
             )
             
-            bom_item_mappings.append((bom_item_id, row))
+            bom_item_mappings.append((bom_item_id, part_id, row, snapshot_attributes))
         
         # ========================================================================
         # STEP 3: Create Snapshot (ALWAYS)
@@ -979,19 +1362,19 @@ def ingest_bom_snapshot(
         # This is acceptable because identical rows (same part+assembly+context)
         # represent the same usage and should be treated as one bom_item.
         
-        created_count = 0
+        snapshot_items = []
         bom_item_seen = {}  # Track bom_item_id -> first row for duplicate detection
         
-        for bom_item_id, row in bom_item_mappings:
-            # Extract snapshot-local attributes (row_index, reference_designator, etc.)
-            snapshot_attributes = _extract_snapshot_attributes(row)
-            
-            # Compute deterministic checksum
-            # This allows detecting changes between snapshots
-            checksum = _compute_checksum(
-                quantity=row.quantity,
-                attributes=snapshot_attributes
-            )
+        # Compute deterministic checksums for the whole snapshot in one pass
+        # This allows detecting changes between snapshots
+        # (snapshot-local attributes were extracted in Step 2)
+        digests = _compute_checksums_batch(
+            (part_id, row.quantity, snapshot_attributes)
+            for _, part_id, row, snapshot_attributes in bom_item_mappings
+        )
+        
+        for (bom_item_id, _, row, snapshot_attributes), digest in zip(bom_item_mappings, digests):
+            checksum, attributes_checksum, semantic_key = digest
             
             # Check if we've already seen this bom_item_id in this snapshot
             if bom_item_id in bom_item_seen:
@@ -1008,22 +1391,23 @@ def ingest_bom_snapshot(
             else:
                 bom_item_seen[bom_item_id] = row
             
-            # Insert snapshot_item (or update if duplicate)
-            # ON CONFLICT ensures we don't fail on duplicates
-            db.insert_snapshot_item(
-                snapshot_id=snapshot_id,
-                bom_item_id=bom_item_id,
-                quantity=row.quantity,
-                attributes=snapshot_attributes,
-                checksum=checksum
-            )
-            
-            created_count += 1
+            snapshot_items.append({
+                'bom_item_id': bom_item_id,
+                'quantity': row.quantity,
+                'attributes': snapshot_attributes,
+                'checksum': checksum,
+                'attributes_checksum': attributes_checksum,
+                'semantic_key': semantic_key
+            })
+        
+        # Insert all snapshot_items in one batch (a duplicate bom_item_id
+        # updates the earlier item, so the last row wins)
+        db.insert_snapshot_items_bulk(snapshot_id, snapshot_items)
         
         if debug:
             logger.info(
-                f"Snapshot items inserted: {created_count} items "
-                f"(reused entities: {len(set(bom_item_id for bom_item_id, _ in bom_item_mappings))} bom_items)"
+                f"Snapshot items inserted: {len(snapshot_items)} items "
+                f"(reused entities: {len(set(bom_item_id for bom_item_id, _, _, _ in bom_item_mappings))} bom_items)"
             )
         
         # Commit transaction
@@ -20,25 +20,43 @@ To get your connection string:
 - Format: postgresql://postgres:[password]@[host]:5432/postgres
 """
 
+import json
 import logging
 import os
-from typing import Optional, Dict, Any, List, Tuple
+import threading
+from typing import Optional, Dict, Any, FrozenSet, List, Tuple
 from uuid import UUID, uuid4
 import psycopg2
-from psycopg2.extras import RealDictCursor, Json
-from psycopg2.pool import SimpleConnectionPool
+from psycopg2.extras import RealDictCursor, Json, execute_values, register_uuid
+from psycopg2.pool import ThreadedConnectionPool
 from difflib import SequenceMatcher
+from functools import lru_cache
 
 from .snapshot_ingest import DatabaseClient
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round-trip when streaming snapshot rows with a server-side cursor
+STREAM_ITERSIZE = 5000
 
+# Rows sent per INSERT statement by insert_snapshot_items_bulk()
+INSERT_PAGE_SIZE = 1000
+
+# Smallest pool that allows concurrent reads: the diff checks out up to three
+# connections at once, plus one that may be held by an ingest transaction.
+# ThreadedConnectionPool raises instead of waiting when it is exhausted.
+CONCURRENT_READS_MIN_CONNECTIONS = 4
+
+
+@lru_cache(maxsize=4096)
 def _string_similarity(a: str, b: str) -> float:
     """
     Compute string similarity using SequenceMatcher.
     
     Returns a value between 0.0 (no similarity) and 1.0 (identical).
+    
+    Cached: context values (notes, placement) repeat across the rows of a
+    BOM and are compared against the same candidates over and over.
     """
     if not a or not b:
         return 0.0
@@ -59,8 +77,8 @@ def _jsonb_similarity(
     if not attrs1 or not attrs2:
         return 0.0
     
-    # Get all unique keys
-    all_keys = set(attrs1.keys()) | set(attrs2.keys())
+    # Get all unique keys (dict-view union, no intermediate key sets)
+    all_keys = attrs1.keys() | attrs2.keys()
     if not all_keys:
         return 1.0
     
@@ -100,11 +118,20 @@ class SupabaseClient(DatabaseClient):
     Connects to Supabase Postgres using connection pooling and implements
     all database operations required for snapshot-based BOM ingestion.
     
+    Reads outside a transaction each use their own pooled connection, so they
+    can be issued from several threads when the pool is large enough
+    (see supports_concurrent_reads).
+    
     Connection can be configured via:
     - Environment variables (SUPABASE_DB_URL or individual connection params)
     - Constructor parameters
     """
     
+    @property
+    def supports_concurrent_reads(self) -> bool:
+        """Whether the pool has room for the diff's concurrent reads."""
+        return self.maxconn >= CONCURRENT_READS_MIN_CONNECTIONS
+    
     def __init__(
         self,
         db_url: Optional[str] = None,
@@ -160,7 +187,14 @@ class SupabaseClient(DatabaseClient):
         self.minconn = minconn
         self.maxconn = maxconn
         self._pool = None
+        self._pool_lock = threading.Lock()
         self._transaction_conn = None
+        self._snapshot_item_columns: Optional[FrozenSet[str]] = None  # Checked on first use
+        self._bom_items_has_context: Optional[bool] = None  # Checked on first use
+        
+        # Matching candidates loaded once per transaction (see _get_part_candidates)
+        self._part_candidates: Dict[UUID, List[Tuple[UUID, str, Dict[str, Any]]]] = {}
+        self._bom_item_candidates: Dict[UUID, Dict[UUID, List[Tuple[UUID, Dict[str, Any]]]]] = {}
     
     def _build_connection_string(
         self,
@@ -181,16 +215,18 @@ class SupabaseClient(DatabaseClient):
         port = port or 5432
         return f"postgresql://{user}:{password}@{host}:{port}/{database}"
     
-    def _get_connection_pool(self) -> SimpleConnectionPool:
+    def _get_connection_pool(self) -> ThreadedConnectionPool:
         """Get or create connection pool."""
         if self._pool is None:
-            self._pool = SimpleConnectionPool(
-                self.minconn,
-                self.maxconn,
-                dsn=self.db_url
-            )
-            if not self._pool:
-                raise RuntimeError("Failed to create database connection pool")
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadedConnectionPool(
+                        self.minconn,
+                        self.maxconn,
+                        dsn=self.db_url
+                    )
+                    if not self._pool:
+                        raise RuntimeError("Failed to create database connection pool")
         return self._pool
     
     def _get_connection(self):
@@ -210,6 +246,7 @@ class SupabaseClient(DatabaseClient):
         
         self._transaction_conn = self._get_connection()
         self._transaction_conn.autocommit = False
+        self._clear_candidate_caches()
     
     def commit_transaction(self) -> None:
         """Commit the current transaction."""
@@ -221,6 +258,7 @@ class SupabaseClient(DatabaseClient):
         finally:
             self._return_connection(self._transaction_conn)
             self._transaction_conn = None
+            self._clear_candidate_caches()
     
     def rollback_transaction(self) -> None:
         """Rollback the current transaction."""
@@ -232,6 +270,12 @@ class SupabaseClient(DatabaseClient):
         finally:
             self._return_connection(self._transaction_conn)
             self._transaction_conn = None
+            self._clear_candidate_caches()
+    
+    def _clear_candidate_caches(self) -> None:
+        """Forget the matching candidates loaded in the current transaction."""
+        self._part_candidates.clear()
+        self._bom_item_candidates.clear()
     
     def _get_cursor(self, dict_cursor: bool = True):
         """Get a cursor from the current transaction connection."""
@@ -242,6 +286,22 @@ class SupabaseClient(DatabaseClient):
             return self._transaction_conn.cursor(cursor_factory=RealDictCursor)
         return self._transaction_conn.cursor()
     
+    def _get_streaming_cursor(self, conn, dict_cursor: bool = False):
+        """
+        Get a server-side (named) cursor on a pooled connection.
+        
+        Iterating it fetches STREAM_ITERSIZE rows per round-trip instead of
+        materializing the whole result with fetchall(). bom_item_id and other
+        uuid columns come back as UUID objects.
+        """
+        cursor = conn.cursor(
+            name=f"bomkit_stream_{uuid4().hex}",
+            cursor_factory=RealDictCursor if dict_cursor else None
+        )
+        cursor.itersize = STREAM_ITERSIZE
+        register_uuid(conn_or_curs=cursor)
+        return cursor
+    
     def get_assembly_by_id(
         self,
         org_id: UUID,
@@ -345,6 +405,33 @@ class SupabaseClient(DatabaseClient):
         finally:
             cursor.close()
     
+    def _get_part_candidates(self, org_id: UUID) -> List[Tuple[UUID, str, Dict[str, Any]]]:
+        """
+        Get the (id, name, attributes) of every part in the organization.
+        
+        Loaded with one query per transaction and kept up to date by
+        create_part(), so matching a whole BOM does not re-read the parts
+        table for every row while still seeing parts created by earlier rows.
+        """
+        candidates = self._part_candidates.get(org_id)
+        if candidates is None:
+            cursor = self._get_cursor()
+            try:
+                cursor.execute("""
+                    SELECT id, name, attributes
+                    FROM parts
+                    WHERE org_id = %s
+                """, (str(org_id),))
+                
+                candidates = [
+                    (UUID(row['id']), row['name'], row['attributes'] or {})
+                    for row in cursor.fetchall()
+                ]
+            finally:
+                cursor.close()
+            self._part_candidates[org_id] = candidates
+        return candidates
+    
     def find_similar_parts(
         self,
         org_id: UUID,
@@ -357,40 +444,39 @@ class SupabaseClient(DatabaseClient):
         
         Uses name similarity and attribute overlap to find matches.
         """
-        cursor = self._get_cursor()
+        matches = []
         
-        try:
-            # Get all parts in the organization
-            cursor.execute("""
-                SELECT id, name, attributes
-                FROM parts
-                WHERE org_id = %s
-            """, (str(org_id),))
-            
-            candidates = cursor.fetchall()
-            matches = []
-            
-            for candidate in candidates:
-                # Compute name similarity
-                name_sim = _string_similarity(part_name, candidate['name'])
-                
-                # Compute attribute similarity
-                candidate_attrs = candidate['attributes'] or {}
-                attr_sim = _jsonb_similarity(attributes, candidate_attrs)
-                
-                # Combined score (weighted: 60% name, 40% attributes)
-                combined_score = (name_sim * 0.6) + (attr_sim * 0.4)
-                
-                if combined_score >= similarity_threshold:
-                    matches.append((UUID(candidate['id']), combined_score))
+        # The name is compared against every part in the org, so candidates
+        # are first checked against difflib's cheap upper bounds of ratio():
+        # one that misses the threshold even with identical attributes
+        # (attr_sim = 1.0) is skipped before the full name and attribute scoring
+        matcher = SequenceMatcher(None, part_name.lower() if part_name else "", "")
+        
+        for candidate_id, candidate_name, candidate_attrs in self._get_part_candidates(org_id):
+            # Compute name similarity
+            if part_name and candidate_name:
+                matcher.set_seq2(candidate_name.lower())
+                if (matcher.real_quick_ratio() * 0.6) + 0.4 < similarity_threshold:
+                    continue
+                if (matcher.quick_ratio() * 0.6) + 0.4 < similarity_threshold:
+                    continue
+                name_sim = matcher.ratio()
+            else:
+                name_sim = 0.0
             
-            # Sort by confidence descending
-            matches.sort(key=lambda x: x[1], reverse=True)
+            # Compute attribute similarity
+            attr_sim = _jsonb_similarity(attributes, candidate_attrs)
             
-            return matches
+            # Combined score (weighted: 60% name, 40% attributes)
+            combined_score = (name_sim * 0.6) + (attr_sim * 0.4)
             
-        finally:
-            cursor.close()
+            if combined_score >= similarity_threshold:
+                matches.append((candidate_id, combined_score))
+        
+        # Sort by confidence descending
+        matches.sort(key=lambda x: x[1], reverse=True)
+        
+        return matches
     
     def create_part(
         self,
@@ -408,10 +494,64 @@ class SupabaseClient(DatabaseClient):
                 VALUES (%s, %s, %s, %s::jsonb, NOW())
             """, (str(part_id), str(org_id), part_name, Json(attributes)))
             
-            return part_id
-            
         finally:
             cursor.close()
+        
+        # Later rows in this transaction must be able to match the new part;
+        # attributes are cached as they would read back from jsonb
+        candidates = self._part_candidates.get(org_id)
+        if candidates is not None:
+            candidates.append((part_id, part_name, json.loads(json.dumps(attributes))))
+        
+        return part_id
+    
+    def _bom_items_context_column(self, cursor) -> bool:
+        """Check (once per client) whether bom_items_ has a context column."""
+        if self._bom_items_has_context is None:
+            cursor.execute("""
+                SELECT column_name 
+                FROM information_schema.columns 
+                WHERE table_name = 'bom_items_' AND column_name = 'context'
+            """)
+            self._bom_items_has_context = cursor.fetchone() is not None
+        return self._bom_items_has_context
+    
+    def _get_bom_item_candidates(self, assembly_id: UUID) -> Dict[UUID, List[Tuple[UUID, Dict[str, Any]]]]:
+        """
+        Get the (id, context) of every bom_item in the assembly, by part_id.
+        
+        Loaded with one query per transaction and kept up to date by
+        create_bom_item(), like _get_part_candidates().
+        """
+        candidates = self._bom_item_candidates.get(assembly_id)
+        if candidates is None:
+            cursor = self._get_cursor()
+            try:
+                if self._bom_items_context_column(cursor):
+                    cursor.execute("""
+                        SELECT id, part_id, context
+                        FROM bom_items_
+                        WHERE assembly_id = %s
+                    """, (str(assembly_id),))
+                else:
+                    cursor.execute("""
+                        SELECT id, part_id
+                        FROM bom_items_
+                        WHERE assembly_id = %s
+                    """, (str(assembly_id),))
+                
+                candidates = {}
+                for row in cursor.fetchall():
+                    context = row.get('context') or {}
+                    if isinstance(context, str):
+                        context = json.loads(context)
+                    candidates.setdefault(UUID(row['part_id']), []).append(
+                        (UUID(row['id']), context)
+                    )
+            finally:
+                cursor.close()
+            self._bom_item_candidates[assembly_id] = candidates
+        return candidates
     
     def find_similar_bom_items(
         self,
@@ -425,68 +565,33 @@ class SupabaseClient(DatabaseClient):
         
         Matches using assembly_id, part_id, and context similarity.
         """
-        cursor = self._get_cursor()
+        if not isinstance(part_id, UUID):
+            part_id = UUID(str(part_id))
+        candidates = self._get_bom_item_candidates(assembly_id).get(part_id, [])
         
-        try:
-            # First, check if context column exists
-            cursor.execute("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name = 'bom_items_' AND column_name = 'context'
-            """)
-            has_context = cursor.fetchone() is not None
-            
-            if not has_context:
-                # If context column doesn't exist, just match by assembly_id and part_id
-                # This allows the system to work even if schema is slightly different
-                logger.warning(
-                    "bom_items_ table does not have 'context' column. "
-                    "Matching only by assembly_id and part_id. "
-                    "Consider adding 'context jsonb' column to bom_items_ table."
-                )
-                cursor.execute("""
-                    SELECT id
-                    FROM bom_items_
-                    WHERE assembly_id = %s AND part_id = %s
-                """, (str(assembly_id), str(part_id)))
-                
-                candidates = cursor.fetchall()
-                matches = []
-                
-                for candidate in candidates:
-                    # If no context column, assume perfect match (1.0) if assembly+part match
-                    matches.append((UUID(candidate['id']), 1.0))
-                
-                matches.sort(key=lambda x: x[1], reverse=True)
-                return matches
-            
-            # Get all bom_items_ for this assembly and part with context
-            cursor.execute("""
-                SELECT id, context
-                FROM bom_items_
-                WHERE assembly_id = %s AND part_id = %s
-            """, (str(assembly_id), str(part_id)))
-            
-            candidates = cursor.fetchall()
-            matches = []
-            
-            for candidate in candidates:
-                candidate_context = candidate.get('context') or {}
-                if isinstance(candidate_context, str):
-                    import json
-                    candidate_context = json.loads(candidate_context)
-                context_sim = _jsonb_similarity(context, candidate_context)
-                
-                if context_sim >= similarity_threshold:
-                    matches.append((UUID(candidate['id']), context_sim))
-            
-            # Sort by confidence descending
-            matches.sort(key=lambda x: x[1], reverse=True)
-            
-            return matches
+        if not self._bom_items_has_context:
+            # If context column doesn't exist, just match by assembly_id and part_id
+            # This allows the system to work even if schema is slightly different
+            logger.warning(
+                "bom_items_ table does not have 'context' column. "
+                "Matching only by assembly_id and part_id. "
+                "Consider adding 'context jsonb' column to bom_items_ table."
+            )
+            # If no context column, assume perfect match (1.0) if assembly+part match
+            return [(candidate_id, 1.0) for candidate_id, _ in candidates]
+        
+        matches = []
+        
+        for candidate_id, candidate_context in candidates:
+            context_sim = _jsonb_similarity(context, candidate_context)
             
-        finally:
-            cursor.close()
+            if context_sim >= similarity_threshold:
+                matches.append((candidate_id, context_sim))
+        
+        # Sort by confidence descending
+        matches.sort(key=lambda x: x[1], reverse=True)
+        
+        return matches
     
     def create_bom_item(
         self,
@@ -498,13 +603,7 @@ class SupabaseClient(DatabaseClient):
         cursor = self._get_cursor()
         
         try:
-            # Check if context column exists
-            cursor.execute("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name = 'bom_items_' AND column_name = 'context'
-            """)
-            has_context = cursor.fetchone() is not None
+            has_context = self._bom_items_context_column(cursor)
             
             bom_item_id = uuid4()
             
@@ -525,10 +624,16 @@ class SupabaseClient(DatabaseClient):
                     VALUES (%s, %s, %s, NOW())
                 """, (str(bom_item_id), str(assembly_id), str(part_id)))
             
-            return bom_item_id
-            
         finally:
             cursor.close()
+        
+        # Later rows in this transaction must be able to match the new bom_item
+        candidates = self._bom_item_candidates.get(assembly_id)
+        if candidates is not None:
+            stored_context = json.loads(json.dumps(context)) if has_context else {}
+            candidates.setdefault(part_id, []).append((bom_item_id, stored_context))
+        
+        return bom_item_id
     
     def create_snapshot(
         self,
@@ -552,13 +657,61 @@ class SupabaseClient(DatabaseClient):
         finally:
             cursor.close()
     
+    def _snapshot_items_optional_columns(self, cursor) -> FrozenSet[str]:
+        """
+        Get which of the optional snapshot_items columns exist (dict cursor).
+        
+        attributes_checksum and semantic_key are added by migrations and may be
+        missing on older databases. The schema does not change while a client
+        is alive, so the result is cached after the first lookup.
+        """
+        if self._snapshot_item_columns is None:
+            cursor.execute("""
+                SELECT column_name 
+                FROM information_schema.columns 
+                WHERE table_name = 'snapshot_items'
+                  AND column_name IN ('attributes_checksum', 'semantic_key')
+            """)
+            self._snapshot_item_columns = frozenset(
+                row['column_name'] for row in cursor.fetchall()
+            )
+        return self._snapshot_item_columns
+    
+    def _snapshot_item_insert_sql(self, cursor) -> Tuple[List[str], str, str]:
+        """
+        Build the snapshot_items upsert for the columns this database has.
+        
+        Returns the optional columns to fill, the row template for VALUES and
+        the statement with the VALUES list left as a single %s.
+        """
+        optional = [
+            column for column in ("attributes_checksum", "semantic_key")
+            if column in self._snapshot_items_optional_columns(cursor)
+        ]
+        columns = ["snapshot_id", "bom_item_id", "quantity", "attributes", "checksum", *optional]
+        template = "(" + ", ".join(["%s", "%s", "%s", "%s::jsonb", "%s"] + ["%s"] * len(optional)) + ")"
+        updates = ",\n".join(
+            f"                    {column} = EXCLUDED.{column}"
+            for column in columns[2:]
+        )
+        sql = f"""
+                INSERT INTO snapshot_items ({', '.join(columns)})
+                VALUES %s
+                ON CONFLICT (snapshot_id, bom_item_id)
+                DO UPDATE SET
+{updates}
+            """
+        return optional, template, sql
+    
     def insert_snapshot_item(
         self,
         snapshot_id: UUID,
         bom_item_id: UUID,
         quantity: Optional[int],
         attributes: Dict[str, Any],
-        checksum: str
+        checksum: str,
+        attributes_checksum: Optional[str] = None,
+        semantic_key: Optional[str] = None
     ) -> None:
         """
         Insert a snapshot_item (materialized state at snapshot time).
@@ -566,19 +719,57 @@ class SupabaseClient(DatabaseClient):
         Uses ON CONFLICT as a safety net - since each CSV row should resolve to
         a unique bom_item_id (via row_index in context), conflicts should be rare.
         If a conflict occurs, it updates the values instead of failing.
+        
+        attributes_checksum and semantic_key are only stored if their columns
+        exist (see migrations/).
+        """
+        self.insert_snapshot_items_bulk(snapshot_id, [{
+            'bom_item_id': bom_item_id,
+            'quantity': quantity,
+            'attributes': attributes,
+            'checksum': checksum,
+            'attributes_checksum': attributes_checksum,
+            'semantic_key': semantic_key
+        }])
+    
+    def insert_snapshot_items_bulk(
+        self,
+        snapshot_id: UUID,
+        items: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Insert many snapshot_items with execute_values (one statement per page).
+        
+        One INSERT ... ON CONFLICT DO UPDATE cannot touch the same row twice, so
+        repeated bom_item_ids are collapsed first, keeping the last item - the
+        same outcome as inserting them one at a time. (COPY is not used because
+        it cannot upsert.)
         """
+        if not items:
+            return
+        
+        latest: Dict[UUID, Dict[str, Any]] = {}
+        for item in items:
+            latest[item['bom_item_id']] = item
+        
         cursor = self._get_cursor()
         
         try:
-            cursor.execute("""
-                INSERT INTO snapshot_items (snapshot_id, bom_item_id, quantity, attributes, checksum)
-                VALUES (%s, %s, %s, %s::jsonb, %s)
-                ON CONFLICT (snapshot_id, bom_item_id)
-                DO UPDATE SET
-                    quantity = EXCLUDED.quantity,
-                    attributes = EXCLUDED.attributes,
-                    checksum = EXCLUDED.checksum
-            """, (str(snapshot_id), str(bom_item_id), quantity, Json(attributes), checksum))
+            optional_columns, template, sql = self._snapshot_item_insert_sql(cursor)
+            snapshot_id_str = str(snapshot_id)
+            rows = [
+                (
+                    snapshot_id_str,
+                    str(item['bom_item_id']),
+                    item['quantity'],
+                    Json(item['attributes']),
+                    item['checksum'],
+                    *(item.get(column) for column in optional_columns)
+                )
+                for item in latest.values()
+            ]
+            
+            execute_values(cursor, sql, rows, template=template, page_size=INSERT_PAGE_SIZE)
             
         finally:
             cursor.close()
@@ -626,6 +817,194 @@ class SupabaseClient(DatabaseClient):
             cursor.close()
             self._return_connection(conn)
     
+    def get_snapshot_checksums(
+        self,
+        snapshot_id: UUID
+    ) -> Dict[UUID, str]:
+        """
+        Get the checksum of every item in a snapshot.
+        
+        Reads only (bom_item_id, checksum) so the diff engine can find changed
+        items without loading quantities and attributes.
+        """
+        conn = self._get_connection()
+        cursor = self._get_streaming_cursor(conn)
+        
+        try:
+            cursor.execute("""
+                SELECT bom_item_id, checksum
+                FROM snapshot_items
+                WHERE snapshot_id = %s
+            """, (str(snapshot_id),))
+            
+            return dict(cursor)
+            
+        finally:
+            cursor.close()
+            self._return_connection(conn)
+    
+    def get_snapshot_checksums_multi(
+        self,
+        snapshot_ids: List[UUID]
+    ) -> Dict[UUID, Dict[UUID, str]]:
+        """
+        Get the item checksums of several snapshots in a single query.
+        """
+        result: Dict[UUID, Dict[UUID, str]] = {
+            snapshot_id: {} for snapshot_id in snapshot_ids
+        }
+        if not snapshot_ids:
+            return result
+        by_str = {str(snapshot_id): checksums for snapshot_id, checksums in result.items()}
+        
+        conn = self._get_connection()
+        cursor = self._get_streaming_cursor(conn)
+        
+        try:
+            cursor.execute("""
+                SELECT snapshot_id, bom_item_id, checksum
+                FROM snapshot_items
+                WHERE snapshot_id = ANY(%s::uuid[])
+            """, (list(by_str),))
+            
+            for snapshot_id, bom_item_id, checksum in cursor:
+                by_str[str(snapshot_id)][bom_item_id] = checksum
+            
+            return result
+            
+        finally:
+            cursor.close()
+            self._return_connection(conn)
+    
+    def diff_snapshot_checksums(
+        self,
+        snapshot_a_id: UUID,
+        snapshot_b_id: UUID
+    ) -> Dict[str, Any]:
+        """
+        Classify the bom_items of two snapshots by checksum in the database.
+        
+        A FULL OUTER JOIN on bom_item_id returns only the rows whose checksum
+        differs (including items missing from one side); unchanged items are
+        only counted and never leave the database.
+        """
+        removed: List[UUID] = []
+        added: List[UUID] = []
+        changed: List[UUID] = []
+        
+        conn = self._get_connection()
+        try:
+            cursor = self._get_streaming_cursor(conn)
+            try:
+                cursor.execute("""
+                    SELECT a.bom_item_id, b.bom_item_id
+                    FROM (
+                        SELECT bom_item_id, checksum
+                        FROM snapshot_items
+                        WHERE snapshot_id = %s
+                    ) a
+                    FULL OUTER JOIN (
+                        SELECT bom_item_id, checksum
+                        FROM snapshot_items
+                        WHERE snapshot_id = %s
+                    ) b ON a.bom_item_id = b.bom_item_id
+                    WHERE a.checksum IS DISTINCT FROM b.checksum
+                """, (str(snapshot_a_id), str(snapshot_b_id)))
+                
+                for bom_item_id_a, bom_item_id_b in cursor:
+                    if bom_item_id_b is None:
+                        removed.append(bom_item_id_a)
+                    elif bom_item_id_a is None:
+                        added.append(bom_item_id_b)
+                    else:
+                        changed.append(bom_item_id_a)
+            finally:
+                cursor.close()
+            
+            cursor = conn.cursor()
+            try:
+                cursor.execute("""
+                    SELECT COUNT(*)
+                    FROM snapshot_items a
+                    JOIN snapshot_items b
+                        ON a.bom_item_id = b.bom_item_id
+                        AND a.checksum = b.checksum
+                    WHERE a.snapshot_id = %s AND b.snapshot_id = %s
+                """, (str(snapshot_a_id), str(snapshot_b_id)))
+                unchanged_count = cursor.fetchone()[0]
+            finally:
+                cursor.close()
+            
+            return {
+                'removed': removed,
+                'added': added,
+                'changed': changed,
+                'unchanged_count': unchanged_count
+            }
+            
+        finally:
+            self._return_connection(conn)
+    
+    def get_snapshot_items_by_ids(
+        self,
+        snapshot_id: UUID,
+        bom_item_ids: List[UUID]
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the snapshot items for a subset of bom_items.
+        
+        Same rows as get_snapshot_items(), restricted to bom_item_ids, except
+        that bom_item_id is returned as a UUID.
+        """
+        if not bom_item_ids:
+            return []
+        
+        conn = self._get_connection()
+        
+        try:
+            # A named cursor executes exactly one query, so the column check
+            # (cached after the first call) runs on its own cursor
+            with conn.cursor(cursor_factory=RealDictCursor) as check_cursor:
+                optional_columns = self._snapshot_items_optional_columns(check_cursor)
+            optional_select = ",\n".join(
+                f"                        {column}" if column in optional_columns
+                else f"                        NULL as {column}"
+                for column in ("attributes_checksum", "semantic_key")
+            )
+            
+            # Plain tuple rows: each row becomes one dict below, without an
+            # intermediate RealDictRow per row
+            cursor = self._get_streaming_cursor(conn)
+            try:
+                cursor.execute(f"""
+                    SELECT 
+                        bom_item_id,
+                        quantity,
+                        attributes,
+                        checksum,
+{optional_select}
+                    FROM snapshot_items
+                    WHERE snapshot_id = %s
+                      AND bom_item_id = ANY(%s::uuid[])
+                """, (str(snapshot_id), [str(bid) for bid in bom_item_ids]))
+                
+                return [
+                    {
+                        'bom_item_id': bom_item_id,
+                        'quantity': quantity,
+                        'attributes': attributes or {},
+                        'checksum': checksum,
+                        'attributes_checksum': attributes_checksum,
+                        'semantic_key': semantic_key
+                    }
+                    for bom_item_id, quantity, attributes, checksum, attributes_checksum, semantic_key in cursor
+                ]
+            finally:
+                cursor.close()
+            
+        finally:
+            self._return_connection(conn)
+    
     def get_bom_item_details(
         self,
         bom_item_ids: List[UUID]
@@ -705,6 +1084,42 @@ class SupabaseClient(DatabaseClient):
             cursor.close()
             self._return_connection(conn)
     
+    def get_bom_item_part_ids(
+        self,
+        bom_item_ids: List[UUID]
+    ) -> Dict[UUID, Optional[UUID]]:
+        """
+        Get the part_id of each bom_item.
+        
+        Same rows as get_bom_item_details(), without the part attributes and
+        context payloads.
+        """
+        if not bom_item_ids:
+            return {}
+        
+        conn = self._get_connection()
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        
+        try:
+            cursor.execute("""
+                SELECT 
+                    bi.id as bom_item_id,
+                    bi.part_id
+                FROM bom_items_ bi
+                JOIN assemblies a ON bi.assembly_id = a.id
+                JOIN parts p ON bi.part_id = p.id
+                WHERE bi.id = ANY(%s::uuid[])
+            """, ([str(bid) for bid in bom_item_ids],))
+            
+            return {
+                UUID(row['bom_item_id']): UUID(row['part_id'])
+                for row in cursor.fetchall()
+            }
+            
+        finally:
+            cursor.close()
+            self._return_connection(conn)
+    
     def get_snapshot_info(
         self,
         snapshot_id: UUID
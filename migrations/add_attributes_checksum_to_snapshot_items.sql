@@ -0,0 +1,21 @@
+-- Migration: Add attributes_checksum column to snapshot_items table
+-- This column stores a checksum of the semantic attributes alone, so the diff
+-- engine can skip attribute comparison for quantity-only changes
+
+-- Check if column already exists before adding
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 
+        FROM information_schema.columns 
+        WHERE table_name = 'snapshot_items' 
+        AND column_name = 'attributes_checksum'
+    ) THEN
+        ALTER TABLE snapshot_items 
+        ADD COLUMN attributes_checksum TEXT;
+        
+        -- Add comment for documentation
+        COMMENT ON COLUMN snapshot_items.attributes_checksum IS 
+            'SHA256 of the semantic attributes only (NULL for items ingested before this column existed)';
+    END IF;
+END $$;
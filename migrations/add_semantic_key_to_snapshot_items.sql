@@ -0,0 +1,24 @@
+-- Migration: Add semantic_key column to snapshot_items table
+-- This column stores the semantic matching key (part + quantity + semantic
+-- attributes) computed at ingest, so the diff engine does not rebuild it
+
+-- Check if column already exists before adding
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 
+        FROM information_schema.columns 
+        WHERE table_name = 'snapshot_items' 
+        AND column_name = 'semantic_key'
+    ) THEN
+        ALTER TABLE snapshot_items 
+        ADD COLUMN semantic_key VARCHAR(32);
+        
+        -- Add comment for documentation
+        COMMENT ON COLUMN snapshot_items.semantic_key IS 
+            'MD5 of part_id + quantity + semantic attributes (NULL for items ingested before this column existed)';
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS snapshot_items_snapshot_semantic_key_idx
+    ON snapshot_items (snapshot_id, semantic_key);
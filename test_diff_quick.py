@@ -56,7 +56,7 @@ def print_diff_result(diff: DiffResult, db: SupabaseClient):
     print()
     
     # Get all bom_item details we need
-    all_bom_item_ids = diff.added_items + diff.removed_items + [m.bom_item_id for m in diff.modified_items]
+    all_bom_item_ids = [*diff.added_items, *diff.removed_items, *(m.bom_item_id for m in diff.modified_items)]
     bom_item_details = db.get_bom_item_details(all_bom_item_ids) if all_bom_item_ids else {}
     
     if diff.added_items:
@@ -41,7 +41,7 @@ from bomkit import BomParser
 from bomkit.adapters.csv_adapter import CsvAdapter
 from bomkit.ingest import (
     ingest_bom_snapshot,
-    normalize_row_from_dict,
+    normalize_rows_from_dicts,
     SupabaseClient
 )
 
@@ -78,10 +78,7 @@ def test_ingest_bom3():
     
     # 2. Convert to NormalizedRow objects
     print("\n🔄 Converting to NormalizedRow objects...")
-    normalized_rows = [
-        normalize_row_from_dict(row_dict, row_index=i)
-        for i, row_dict in enumerate(normalized_dicts)
-    ]
+    normalized_rows = normalize_rows_from_dicts(normalized_dicts)
     print(f"✅ Converted {len(normalized_rows)} rows")
     
     # Show first NormalizedRow for debugging
@@ -8,6 +8,9 @@ These tests verify that:
 4. Fallback to UNCLASSIFIED works correctly
 """
 
+import itertools
+import json
+
 import pytest
 from uuid import uuid4, UUID
 
@@ -31,6 +34,14 @@ from bomkit.diff.change_events import (
     _compute_item_delta_from_modified,
     _compute_item_delta_added,
     _compute_item_delta_removed,
+    _classify_delta,
+    CLASSIFICATION_RULES,
+    FLAG_ADDED,
+    FLAG_REMOVED,
+    FLAG_QUANTITY,
+    FLAG_MANUFACTURER,
+    FLAG_MPN,
+    FLAG_REFDES,
 )
 
 
@@ -158,6 +169,19 @@ class TestItemDeltaComputation:
         assert delta.mpn_changed is True
         assert delta.manufacturer_changed is False
     
+    def test_delta_custom_field_category_precedence(self):
+        """Custom field names use category precedence, not key position."""
+        modified = make_modified_item(changes=[
+            make_field_change("ATTRIBUTE_CHANGED", field="MFR_Manufacturer_Part_Number",
+                            from_value="ABC123", to_value="XYZ789")
+        ])
+        
+        delta = _compute_item_delta_from_modified(modified)
+        
+        # "mfr" occurs first in the name, but MPN keys take precedence
+        assert delta.mpn_changed is True
+        assert delta.manufacturer_changed is False
+    
     def test_delta_refdes_changed(self):
         """Reference designator change should set reference_designator_changed=True."""
         modified = make_modified_item(changes=[
@@ -183,6 +207,8 @@ class TestItemDeltaComputation:
         assert "value" in delta.changed_attributes
         assert "tolerance" in delta.changed_attributes
         assert len(delta.changed_attributes) == 2
+        assert delta.spec_changed_attributes == {"value", "tolerance"}
+        assert delta.other_changed_attributes == set()
     
     def test_delta_multiple_changes(self):
         """Multiple changes should all be detected."""
@@ -207,6 +233,19 @@ class TestItemDeltaComputation:
         delta = _compute_item_delta_from_modified(modified)
         
         assert delta.has_any_change() is False
+    
+    def test_delta_flag_properties(self):
+        """Boolean flag attributes should read and write the flags bitmask."""
+        delta = ItemDelta(bom_item_id=uuid4())
+        
+        delta.mpn_changed = True
+        delta.quantity_changed = True
+        assert delta.flags == FLAG_MPN | FLAG_QUANTITY
+        assert delta.mpn_changed is True
+        assert delta.manufacturer_changed is False
+        
+        delta.mpn_changed = False
+        assert delta.flags == FLAG_QUANTITY
 
 
 # =============================================================================
@@ -307,6 +346,20 @@ class TestClassificationRules:
         assert Domain.MANUFACTURING in event.affected_domains
         assert "5 → 10" in event.summary
     
+    def test_quantity_summary_formatting(self, snapshot_a_id, snapshot_b_id):
+        """Whole-number float quantities display without a fractional part."""
+        modified = make_modified_item(changes=[
+            make_field_change("QUANTITY_CHANGED", from_value=5.0, to_value=2.5)
+        ])
+        diff = make_diff_result(
+            snapshot_a_id, snapshot_b_id,
+            modified_items=[modified]
+        )
+        
+        result = classify_diff(diff)
+        
+        assert result.events[0].summary == "Quantity changed: 5 → 2.5"
+    
     def test_classify_refdes_changed(self, snapshot_a_id, snapshot_b_id):
         """Reference designator change should classify as REFERENCE_DESIGNATOR_CHANGED."""
         modified = make_modified_item(changes=[
@@ -427,6 +480,39 @@ class TestRuleOrdering:
         assert len(result.events) == 1
         assert result.events[0].event_type == ChangeEventType.QUANTITY_CHANGED
 
+    
+    def test_classify_delta_matches_rule_list(self):
+        """_classify_delta should agree with applying CLASSIFICATION_RULES in order."""
+        bits = [
+            FLAG_ADDED, FLAG_REMOVED, FLAG_QUANTITY,
+            FLAG_MANUFACTURER, FLAG_MPN, FLAG_REFDES,
+        ]
+        attribute_sets = [set(), {"value"}, {"color"}, {"color", "tolerance"}]
+        
+        for selected in itertools.product([False, True], repeat=len(bits)):
+            flags = sum(bit for bit, on in zip(bits, selected) if on)
+            for attributes in attribute_sets:
+                delta = ItemDelta(
+                    bom_item_id=uuid4(),
+                    flags=flags,
+                    quantity_from=5,
+                    quantity_to=10
+                )
+                delta.changed_attributes = attributes
+                
+                expected = None
+                if delta.has_any_change():
+                    for rule in CLASSIFICATION_RULES:
+                        expected = rule(delta)
+                        if expected is not None:
+                            break
+                actual = _classify_delta(delta)
+                
+                if expected is None:
+                    assert actual is None
+                else:
+                    assert actual.event_type == expected.event_type
+                    assert actual.summary == expected.summary
 
 # =============================================================================
 # EVIDENCE PRESERVATION TESTS
@@ -446,9 +532,10 @@ class TestEvidencePreservation:
         result = classify_diff(diff)
         event = result.events[0]
         
-        # Added items have no field changes (they're new)
-        assert event.evidence == []
-        assert event.delta is not None
+        # Added items have no field changes (they're new), and no delta
+        # is built for them
+        assert tuple(event.evidence) == ()
+        assert event.delta is None
     
     def test_evidence_on_modified(self, snapshot_a_id, snapshot_b_id):
         """Modified events should preserve all field changes as evidence."""
@@ -472,7 +559,7 @@ class TestEvidencePreservation:
         assert event.evidence[1].field == "value"
     
     def test_delta_attached_to_event(self, snapshot_a_id, snapshot_b_id):
-        """ItemDelta should be attached to event for debugging."""
+        """ItemDelta should be attached to event for debugging when requested."""
         modified = make_modified_item(changes=[
             make_field_change("QUANTITY_CHANGED", from_value=5, to_value=10)
         ])
@@ -481,7 +568,9 @@ class TestEvidencePreservation:
             modified_items=[modified]
         )
         
-        result = classify_diff(diff)
+        assert classify_diff(diff).events[0].delta is None
+        
+        result = classify_diff(diff, keep_delta=True)
         event = result.events[0]
         
         assert event.delta is not None
@@ -562,6 +651,44 @@ class TestClassificationIntegration:
         procurement_events = result.events_by_domain(Domain.PROCUREMENT)
         assert len(procurement_events) == 2  # PART_ADDED and QUANTITY_CHANGED
     
+    def test_classification_result_filters_match_scan(self, snapshot_a_id, snapshot_b_id):
+        """Indexed filters should match a linear scan and return fresh lists."""
+        modified = [
+            make_modified_item(changes=[
+                make_field_change("QUANTITY_CHANGED", from_value=5, to_value=10)
+            ]),
+            make_modified_item(changes=[
+                make_field_change("ATTRIBUTE_CHANGED", field="reference_designator",
+                                from_value="R1,R2", to_value="R1")
+            ]),
+            make_modified_item(changes=[
+                make_field_change("ATTRIBUTE_CHANGED", field="color",
+                                from_value="red", to_value="blue")
+            ]),
+        ]
+        diff = make_diff_result(
+            snapshot_a_id, snapshot_b_id,
+            added_items=[uuid4(), uuid4()],
+            removed_items=[uuid4()],
+            modified_items=modified
+        )
+        
+        result = classify_diff(diff)
+        
+        for event_type in ChangeEventType:
+            expected = [e for e in result.events if e.event_type == event_type]
+            assert result.events_by_type(event_type) == expected
+        for severity in Severity:
+            expected = [e for e in result.events if e.severity == severity]
+            assert result.events_by_severity(severity) == expected
+        for domain in Domain:
+            expected = [e for e in result.events if domain in e.affected_domains]
+            assert result.events_by_domain(domain) == expected
+        
+        # Callers get their own list, not the index
+        result.events_by_type(ChangeEventType.PART_ADDED).clear()
+        assert len(result.events_by_type(ChangeEventType.PART_ADDED)) == 2
+    
     def test_classify_and_summarize(self, snapshot_a_id, snapshot_b_id):
         """classify_and_summarize should produce correct summary."""
         modified = make_modified_item(changes=[
@@ -703,4 +830,21 @@ class TestSerialization:
         assert "snapshot_b_id" in result_dict
         assert result_dict["total_changes"] == 1
         assert len(result_dict["events"]) == 1
-
+    
+    def test_to_json_bytes_matches_to_dict(self, snapshot_a_id, snapshot_b_id):
+        """to_json_bytes() should encode the same payload as to_dict()."""
+        modified = make_modified_item(changes=[
+            make_field_change("QUANTITY_CHANGED", from_value=5, to_value=10),
+            make_field_change("ATTRIBUTE_CHANGED", field="value",
+                            from_value="10kΩ", to_value="22kΩ")
+        ])
+        diff = make_diff_result(
+            snapshot_a_id, snapshot_b_id,
+            added_items=[uuid4()],
+            modified_items=[modified]
+        )
+        
+        result = classify_diff(diff)
+        
+        assert json.loads(result.to_json_bytes()) == result.to_dict()
+        assert json.loads(result.events[1].to_json_bytes()) == result.events[1].to_dict()
@@ -265,9 +265,78 @@ def test_ambiguous_column_matching():
     print(f"{'='*60}\n")
 
 
+def test_type_distribution_matches_float_parsing():
+    """Numeric detection should agree with float() on tricky inputs."""
+    
+    profiler = ColumnProfiler()
+    values = [
+        "10", "-3.5", "+.5", "5.", "1e5", "1E-3", "1_000", "inf", "-Infinity",
+        "NaN", "٣", "１２",
+        "1__0", "_1", "1_", "0x1F", "1e", ".", "e5", "1.5j", "ınf", "²", "10k",
+    ]
+    
+    numeric = [v for v in values if profiler.profile_column("c", [v])['type_distribution']['numeric'] == 1.0]
+    
+    expected = []
+    for v in values:
+        try:
+            float(v)
+            expected.append(v)
+        except ValueError:
+            pass
+    assert numeric == expected
+
+
+def test_sampling_is_uniform_and_reproducible():
+    """Long columns are reservoir-sampled; short ones are kept whole."""
+    
+    values = [None, ""] + [f"V{i}" for i in range(1000)]
+    
+    profiler = ColumnProfiler(sample_size=50)
+    sample, null_count = profiler._sample_and_count_nulls(values)
+    
+    assert null_count == 2
+    assert len(sample) == 50
+    # Not just the head of the column
+    assert sample != values[2:52]
+    # Same seed, same sample - also when the column is a one-shot iterator
+    assert profiler._sample_and_count_nulls(iter(values))[0] == sample
+    
+    short = ["R1", None, "R2", ""]
+    assert profiler._sample_and_count_nulls(short) == (["R1", "R2"], 2)
+    
+    profile = profiler.profile_column("Ref", (v for v in values))
+    assert profile['null_count'] == 2
+    assert profile['sample_size'] == 50
+
+
+def test_identical_samples_are_profiled_once():
+    """Repeated columns hit the profile cache but get independent results."""
+    
+    from bomkit.column_profiler import _profile_sample
+    
+    _profile_sample.cache_clear()
+    profiler = ColumnProfiler()
+    values = ["10nF", "100nF", "1kΩ", "470R"]
+    
+    first = profiler.profile_column("Value", values)
+    second = profiler.profile_column("Value (B)", list(values))
+    
+    assert _profile_sample.cache_info().hits == 1
+    assert second['column_name'] == "Value (B)"
+    assert first['unit_presence'] == second['unit_presence']
+    
+    # Mutating one profile must not leak into the cached copy
+    first['unit_presence'].clear()
+    assert profiler.profile_column("Value", values)['unit_presence'] == second['unit_presence']
+
+
 if __name__ == "__main__":
     test_column_profiling()
     test_ambiguous_column_matching()
+    test_type_distribution_matches_float_parsing()
+    test_sampling_is_uniform_and_reproducible()
+    test_identical_samples_are_profiled_once()
     
     print("\n" + "="*60)
     print("All column profiler tests completed!")
@@ -0,0 +1,68 @@
+"""Tests for CsvAdapter row building and encoding fallback."""
+
+import csv
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import bomkit
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bomkit.adapters.csv_adapter import CsvAdapter, _ENCODING_SAMPLE_SIZE
+
+
+def dict_reader_rows(path, encoding="utf-8", delimiter=","):
+    """Rows as csv.DictReader plus a str()-cleaning pass used to produce them."""
+    with open(path, "r", encoding=encoding, newline="") as f:
+        return [
+            {key: str(value) if value is not None else "" for key, value in row.items()}
+            for row in csv.DictReader(f, delimiter=delimiter)
+        ]
+
+
+def test_short_long_and_blank_rows_match_dict_reader(tmp_path):
+    """Short rows are padded, surplus fields go under None, blank lines are skipped."""
+    path = tmp_path / "ragged.csv"
+    path.write_text(
+        "a,b,c,d\r\n"
+        "1,2,3,4\r\n"
+        "\r\n"
+        "5,6\r\n"
+        "7,8,9,10,11,12\r\n"
+        ",,,\r\n"
+        '"multi\nline",x,"",y\r\n'
+        "\r\n"
+        "13\r\n"
+        "\r\n",
+        encoding="utf-8",
+        newline="",
+    )
+    
+    rows = CsvAdapter().read(str(path))
+    
+    assert rows == dict_reader_rows(path)
+    assert rows[1] == {"a": "5", "b": "6", "c": "", "d": ""}
+    assert rows[2][None] == "['11', '12']"
+    assert len(rows) == 6
+
+
+def test_decode_error_after_sample_yields_each_row_once(tmp_path):
+    """Invalid UTF-8 past the detection sample switches encoding without repeating rows."""
+    path = tmp_path / "late_latin1.csv"
+    data = bytearray(b"id,name,qty,note\n")
+    count = 0
+    bad_row = None
+    while len(data) < 2 * _ENCODING_SAMPLE_SIZE:
+        if bad_row is None and len(data) > _ENCODING_SAMPLE_SIZE:
+            bad_row = count
+            name = b"caf\xe9"
+        else:
+            name = b"part%d" % count
+        data += b"%d,%s,1,ok\n" % (count, name)
+        count += 1
+    path.write_bytes(bytes(data))
+    
+    rows = list(CsvAdapter().iread(str(path)))
+    
+    assert [row["id"] for row in rows] == [str(i) for i in range(count)]
+    assert rows[bad_row]["name"] == "caf\xe9"
+    assert rows == dict_reader_rows(path, encoding="latin-1")
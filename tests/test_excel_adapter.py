@@ -0,0 +1,63 @@
+"""Tests for the Excel adapter and its optional calamine backend."""
+
+import sys
+from pathlib import Path
+
+import openpyxl
+import pytest
+
+# Add parent directory to path to import bomkit
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bomkit.adapters import excel_adapter
+from bomkit.adapters.excel_adapter import ExcelAdapter
+
+
+TEST_DIR = Path(__file__).parent
+
+
+def make_multi_sheet_workbook(path):
+    """Workbook with a "Notes" sheet first and the active "BOM" sheet second."""
+    wb = openpyxl.Workbook()
+    notes = wb.active
+    notes.title = "Notes"
+    notes.append(["x", "y"])
+    notes.append([1, 2])
+    
+    bom = wb.create_sheet("BOM")
+    bom.append(["Part Number", "Quantity", "Value"])
+    bom.append(["R1", 2, "10k"])
+    bom.append(["C1", 1, None])
+    
+    wb.active = 1
+    wb.save(path)
+    return path
+
+
+def read_with_openpyxl(monkeypatch, path):
+    with monkeypatch.context() as patch:
+        patch.setattr(excel_adapter, "CalamineWorkbook", None)
+        return ExcelAdapter().read(path)
+
+
+def test_reads_active_sheet(tmp_path, monkeypatch):
+    """The active sheet is read, not the first one."""
+    path = make_multi_sheet_workbook(tmp_path / "multi.xlsx")
+    expected = [
+        {"Part Number": "R1", "Quantity": 2, "Value": "10k"},
+        {"Part Number": "C1", "Quantity": 1, "Value": None},
+    ]
+    
+    assert read_with_openpyxl(monkeypatch, path) == expected
+    assert ExcelAdapter().read(path) == expected
+
+
+@pytest.mark.parametrize("name", ["pcb-bom.xlsx", "multi.xlsx"])
+def test_calamine_matches_openpyxl(tmp_path, monkeypatch, name):
+    """Both backends return the same rows, so the "fast" extra changes nothing."""
+    pytest.importorskip("python_calamine")
+    path = TEST_DIR / name
+    if not path.exists():
+        path = make_multi_sheet_workbook(tmp_path / name)
+    
+    assert ExcelAdapter().read(path) == read_with_openpyxl(monkeypatch, path)